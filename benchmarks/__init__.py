@@ -0,0 +1,98 @@
+# SPDX-License-Identifier: MIT
+#
+# Copyright (c) 2023-2025 Anvilistas project team members listed at
+# https://github.com/anvilistas/reactive/graphs/contributors
+#
+# This software is published at https://github.com/anvilistas/reactive
+
+"""Throughput benchmarks for the reactive core and stores.
+
+Run with ``python -m benchmarks run -o results.json`` from the repo root and
+compare two result files with ``python -m benchmarks compare base.json head.json``.
+"""
+
+import platform
+import subprocess
+import sys
+from statistics import median
+from time import perf_counter
+
+CASES = {}
+
+
+def benchmark(name, number=1):
+    """register a benchmark case
+
+    A case is a generator function: it sets up state, yields the callable to
+    time, then tears down. ``number`` is how many times the callable is run per
+    sample.
+    """
+
+    def register(fn):
+        CASES[name] = (fn, number)
+        return fn
+
+    return register
+
+
+def run_case(name, repeat=5):
+    fn, number = CASES[name]
+    gen = fn()
+    run = next(gen)
+    try:
+        # warm up once so the first sample doesn't pay for lazy setup
+        run()
+        samples = []
+        for _ in range(repeat):
+            start = perf_counter()
+            for _ in range(number):
+                run()
+            samples.append((perf_counter() - start) / number)
+    finally:
+        gen.close()
+
+    return {"best": min(samples), "median": median(samples), "repeat": repeat}
+
+
+def commit():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def run_all(names=None, repeat=5):
+    from . import cases  # noqa: F401 - registers the cases
+
+    names = names or list(CASES)
+    return {
+        "commit": commit(),
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "results": {name: run_case(name, repeat) for name in names},
+    }
+
+
+def compare(base, head, threshold=0.1):
+    """yield (name, base, head, ratio, verdict) for cases present in both runs"""
+    base_results = base["results"]
+    head_results = head["results"]
+    for name, result in head_results.items():
+        if name not in base_results:
+            continue
+        before = base_results[name]["best"]
+        after = result["best"]
+        ratio = after / before if before else float("inf")
+        if ratio > 1 + threshold:
+            verdict = "slower"
+        elif ratio < 1 - threshold:
+            verdict = "faster"
+        else:
+            verdict = ""
+        yield name, before, after, ratio, verdict
@@ -0,0 +1,79 @@
+# SPDX-License-Identifier: MIT
+#
+# Copyright (c) 2023-2025 Anvilistas project team members listed at
+# https://github.com/anvilistas/reactive/graphs/contributors
+#
+# This software is published at https://github.com/anvilistas/reactive
+
+import argparse
+import json
+import sys
+
+from . import CASES, compare, run_all
+
+
+def fmt(seconds):
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f}us"
+    return f"{seconds * 1e3:.2f}ms"
+
+
+def cmd_run(args):
+    from . import cases  # noqa: F401 - registers the cases
+
+    names = [n for n in CASES if not args.k or args.k in n]
+    results = run_all(names, repeat=args.repeat)
+
+    width = max(map(len, names), default=0)
+    for name, result in results["results"].items():
+        print(
+            f"{name:<{width}}  {fmt(result['best']):>10}  {fmt(result['median']):>10}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+def cmd_compare(args):
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.head) as f:
+        head = json.load(f)
+
+    rows = list(compare(base, head, args.threshold))
+    width = max((len(row[0]) for row in rows), default=0)
+    print(f"{base.get('commit')} -> {head.get('commit')}")
+    for name, before, after, ratio, verdict in rows:
+        timings = f"{fmt(before):>10}  {fmt(after):>10}  {ratio:5.2f}x"
+        print(f"{name:<{width}}  {timings}  {verdict}")
+
+    if args.fail and any(row[4] == "slower" for row in rows):
+        return 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="run the benchmarks")
+    run.add_argument("-k", help="only run cases whose name contains this string")
+    run.add_argument("-o", "--output", help="write results to this json file")
+    run.add_argument("--repeat", type=int, default=5)
+    run.set_defaults(func=cmd_run)
+
+    cmp = sub.add_parser("compare", help="compare two result files")
+    cmp.add_argument("base")
+    cmp.add_argument("head")
+    cmp.add_argument("--threshold", type=float, default=0.1)
+    cmp.add_argument(
+        "--fail", action="store_true", help="exit non-zero if any case is slower"
+    )
+    cmp.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
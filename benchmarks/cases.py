@@ -0,0 +1,374 @@
+# SPDX-License-Identifier: MIT
+#
+# Copyright (c) 2023-2025 Anvilistas project team members listed at
+# https://github.com/anvilistas/reactive/graphs/contributors
+#
+# This software is published at https://github.com/anvilistas/reactive
+
+from contextlib import contextmanager
+from operator import mul
+
+from client_code._internal.core import Computation
+from client_code._internal.effect import batch
+from client_code._internal.signal import create_effect, create_root, create_selector
+from client_code.main import (
+    filtered_view,
+    reactive_class,
+    reconcile,
+    signal,
+    sum_of,
+)
+from client_code.main._store import ReactiveDict, ReactiveList
+from client_code.main._table import ReactiveTable
+from client_code.main._utils import is_testing
+
+from . import benchmark
+
+
+@contextmanager
+def client_side():
+    """reactive_class only applies on the client unless we claim to be testing"""
+    code = is_testing.__code__
+    is_testing.__code__ = (lambda: True).__code__
+    try:
+        yield
+    finally:
+        is_testing.__code__ = code
+
+
+# queueMicrotask runs synchronously on the server, so an unbatched write would
+# flush effects part way through notifying; batching matches the client
+def write(node, value):
+    with batch():
+        node.write(value)
+
+
+def in_root(build):
+    """run build inside a root and return (result, dispose)"""
+    return create_root(lambda dispose: (build(), dispose))
+
+
+@benchmark("signal_write_fan_out", number=20)
+def signal_write_fan_out(observers=1_000):
+    source = Computation(0, None)
+    _, dispose = in_root(
+        lambda: [create_effect(lambda: source.read()) for _ in range(observers)]
+    )
+
+    def run():
+        write(source, source._value + 1)
+
+    yield run
+    dispose()
+
+
+@benchmark("memo_chain_deep", number=20)
+def memo_chain_deep(length=1_000):
+    head = Computation(0, None)
+    node = head
+    for _ in range(length):
+        node = Computation(None, lambda _, prev=node: prev.read() + 1)
+        node.read()
+    tail = node
+    _, dispose = in_root(lambda: create_effect(lambda: tail.read()))
+
+    def run():
+        write(head, head._value + 1)
+
+    yield run
+    dispose()
+
+
+@benchmark("long_chain", number=5)
+def long_chain(length=20_000):
+    # deep enough that a recursive update would overflow the stack
+    head = Computation(0, None)
+    node = head
+    for _ in range(length):
+        node = Computation(None, lambda _, prev=node: prev.read() + 1)
+        # read as we go so each initial compute stays shallow
+        node.read()
+    tail = node
+    _, dispose = in_root(lambda: create_effect(lambda: tail.read()))
+
+    def run():
+        write(head, head._value + 1)
+
+    yield run
+    dispose()
+
+
+@benchmark("unlink_fan_out", number=20)
+def unlink_fan_out(observers=10_000):
+    shared = Computation(0, None)
+    toggle = Computation(0, None)
+
+    def compute(prev):
+        if toggle.read() % 2 == 0:
+            shared.read()
+
+    node = Computation(None, compute)
+    node.read()
+    others = [Computation(None, lambda _: shared.read()) for _ in range(observers)]
+    for memo in others:
+        memo.read()
+
+    def run():
+        # alternately drop and re-add one edge to a widely observed signal
+        toggle.write(toggle._value + 1)
+        node.read()
+
+    yield run
+
+
+@benchmark("nested_flush", number=5)
+def nested_flush(depth=50, width=100):
+    source = Computation(0, None)
+
+    def level(d):
+        for _ in range(width):
+            create_effect(lambda: source.read())
+        if d < depth:
+            create_effect(lambda: level(d + 1))
+
+    _, dispose = in_root(lambda: level(1))
+
+    def run():
+        write(source, source._value + 1)
+
+    yield run
+    dispose()
+
+
+@benchmark("diamond", number=20)
+def diamond(width=500):
+    source = Computation(0, None)
+    branches = [
+        Computation(None, lambda _, i=i: source.read() + i) for i in range(width)
+    ]
+    total = Computation(None, lambda _: sum(b.read() for b in branches))
+    _, dispose = in_root(lambda: create_effect(lambda: total.read()))
+
+    def run():
+        write(source, source._value + 1)
+
+    yield run
+    dispose()
+
+
+@benchmark("selection_change", number=20)
+def selection_change(rows=2_000):
+    selected = Computation(0, None)
+
+    def build():
+        is_selected = create_selector(selected.read)
+        for i in range(rows):
+            create_effect(lambda i=i: is_selected(i))
+
+    _, dispose = in_root(build)
+
+    def run():
+        write(selected, (selected._value + 1) % rows)
+
+    yield run
+    dispose()
+
+
+@benchmark("dict_bulk_update", number=5)
+def dict_bulk_update(size=5_000):
+    d = ReactiveDict({i: 0 for i in range(size)})
+    _, dispose = in_root(
+        lambda: [create_effect(lambda: d.values()), create_effect(lambda: d[0])]
+    )
+    counter = [0]
+
+    def run():
+        counter[0] += 1
+        with batch():
+            d.update({i: counter[0] for i in range(size)})
+
+    yield run
+    dispose()
+
+
+@benchmark("dict_key_churn")
+def dict_key_churn(keys=100_000):
+    cache = ReactiveDict()
+    current = Computation(0, None)
+    _, dispose = in_root(lambda: create_effect(lambda: cache.get(current.read())))
+
+    def run():
+        # each key is observed once and then dropped
+        start = current._value + 1
+        for i in range(start, start + keys):
+            cache[i] = {"id": i}
+            current.write(i)
+            cache.pop(i - 1, None)
+        assert len(cache.DICT_SIGNALS) == 1
+
+    yield run
+    dispose()
+
+
+@benchmark("nested_payload_assign", number=2)
+def nested_payload_assign(rows=5_000):
+    d = ReactiveDict()
+    payload = [
+        {"id": i, "tags": ["a", "b"], "meta": {"x": i, "y": [i, i]}}
+        for i in range(rows)
+    ]
+    _, dispose = in_root(lambda: create_effect(lambda: d.get("rows")))
+
+    def run():
+        # only the outer list is wrapped until something reads further in
+        d["rows"] = payload
+        d["rows"][0]["meta"]["x"]
+
+    yield run
+    dispose()
+
+
+@benchmark("reconcile_refresh", number=5)
+def reconcile_refresh(rows=2_000):
+    data = [{"id": i, "name": f"row {i}", "tags": ["a"]} for i in range(rows)]
+    target = reconcile(ReactiveList(), data, key="id")
+
+    def build():
+        for item in target:
+            create_effect(lambda item=item: item["name"])
+
+    _, dispose = in_root(build)
+    index = [0]
+
+    def run():
+        # a refetch where one row changed
+        i = index[0] = (index[0] + 1) % rows
+        fresh = [dict(row) for row in data]
+        fresh[i]["name"] = f"row {i} v{index[0]}"
+        reconcile(target, fresh, key="id")
+
+    yield run
+    dispose()
+
+
+@benchmark("list_append", number=5)
+def list_append(size=5_000):
+    lst = ReactiveList()
+    _, dispose = in_root(lambda: create_effect(lambda: len(lst)))
+
+    def run():
+        with batch():
+            lst.clear()
+            for i in range(size):
+                lst.append(i)
+
+    yield run
+    dispose()
+
+
+@benchmark("list_sort", number=5)
+def list_sort(size=5_000):
+    lst = ReactiveList(range(size))
+    _, dispose = in_root(lambda: create_effect(lambda: lst[0]))
+
+    def run():
+        with batch():
+            lst.reverse()
+            lst.sort()
+
+    yield run
+    dispose()
+
+
+@benchmark("list_iterate", number=5)
+def list_iterate(size=5_000):
+    lst = ReactiveList(range(size))
+
+    def read_all():
+        for _ in lst:
+            pass
+
+    _, dispose = in_root(lambda: None)
+
+    def run():
+        read_all()
+
+    yield run
+    dispose()
+
+
+@benchmark("incremental_sum", number=20)
+def incremental_sum(rows=10_000):
+    records = ReactiveList({"amount": i} for i in range(rows))
+    _, dispose = in_root(lambda: create_effect(sum_of(records, lambda r: r["amount"])))
+    index = [0]
+
+    def run():
+        i = index[0] = (index[0] + 1) % rows
+        records[i]["amount"] += 1
+
+    yield run
+    dispose()
+
+
+@benchmark("filtered_view_edit", number=20)
+def filtered_view_edit(rows=20_000):
+    records = ReactiveList({"amount": i} for i in range(rows))
+
+    def build():
+        odd = filtered_view(records, lambda r: r["amount"] % 2)
+        create_effect(lambda: len(odd()))
+
+    _, dispose = in_root(build)
+    index = [0]
+
+    def run():
+        i = index[0] = (index[0] + 1) % rows
+        records[i]["amount"] += 1
+
+    yield run
+    dispose()
+
+
+@benchmark("table_column_assign", number=5)
+def table_column_assign(rows=50_000):
+    table = ReactiveTable({"price": [1.0] * rows, "qty": list(range(rows))})
+    table.derive("total", lambda price, qty: map(mul, price, qty), "price", "qty")
+    _, dispose = in_root(lambda: create_effect(lambda: table.column("total")))
+    prices = [[1.0] * rows, [2.0] * rows]
+    index = [0]
+
+    def run():
+        index[0] ^= 1
+        table.set_column("price", prices[index[0]])
+
+    yield run
+    dispose()
+
+
+@benchmark("reactive_class_churn", number=5)
+def reactive_class_churn(instances=500):
+    with client_side():
+
+        @reactive_class
+        class Point:
+            z = signal(0)
+
+            def __init__(self, x, y):
+                self.x = x
+                self.y = y
+
+        points = [Point(i, i) for i in range(instances)]
+    _, dispose = in_root(
+        lambda: [create_effect(lambda p=p: p.x + p.y + p.z) for p in points]
+    )
+
+    def run():
+        with batch():
+            for p in points:
+                p.x += 1
+                p.y += 1
+                p.z += 1
+
+    yield run
+    dispose()
@@ -12,6 +12,7 @@ from .constants import (
     STATE_DISPOSED,
     get_state_repr,
 )
+from .equality import getEquals
 from .error import NotReadyError
 from .flags import DEFAULT_FLAGS, ERROR_BIT, LOADING_BIT
 from .owner import Owner, getOwner, setCurrentOwner
@@ -26,19 +27,51 @@ newSources = None
 newSourcesIndex = 0
 newFlags = 0
 
+batchDepth = 0
+batchedNodes = {}
+# store signals left without observers, see removeSourceObservers
+unobservedNodes = []
+# computations being updated, the innermost last
+updateDepth = 0
+# bumped whenever nodes may be marked stale, see effect.runQueue
+notifyCount = 0
+# called with each node notifyObservers marks stale, see profile
+notifyHook = None
+
 UNCHANGED = object()
 
 
 class Computation(Owner):
+    # eager nodes handle their own notification rather than marking observers
+    _eager = False
+    # set on keyed store signals that can be reclaimed once unobserved
+    _storeKey = None
+
+    __slots__ = [
+        "_sources",
+        "_sourceSlots",
+        "_observers",
+        "_observerSlots",
+        "_value",
+        "_compute",
+        "_equals",
+        "_stateFlags",
+        "_handlerMask",
+        "_error",
+        "_loading",
+    ]
+
     def __init__(self, initialValue, compute, equals=None, name=None):
         Owner.__init__(self, compute is None)
         self._sources = None
+        self._sourceSlots = None
         self._observers = None
+        self._observerSlots = None
         self._value = initialValue
         self._compute = compute and wrap_compute(compute)
         self._state = STATE_DIRTY if compute else STATE_CLEAN
         self._name = name or ("compute" if compute else "signal")
-        self._equals = equals if equals is not None else isEqual
+        self._equals = isEqual if equals is None else getEquals(equals)
         self._stateFlags = 0
         self._handlerMask = DEFAULT_FLAGS
         self._error = None
@@ -48,6 +81,7 @@ class Computation(Owner):
         global newFlags
 
         if self._compute:
+            flushBatched()
             self._updateIfNecessary()
 
         track(self)
@@ -95,12 +129,22 @@ class Computation(Owner):
 
         observers = self._observers
 
-        if observers is not None:
-            for o in observers:
-                if valueChanged:
-                    o._notify(STATE_DIRTY)
-                elif changedFlagMask:
-                    o._notifyFlags(changedFlagMask, changedFlags)
+        if (
+            batchDepth
+            and valueChanged
+            and not changedFlagMask
+            and self._compute is None
+            and observers is not None
+        ):
+            # defer notifying observers until the outermost batch exits
+            batchedNodes[self._id] = self
+            return self._value
+
+        if observers:
+            if valueChanged:
+                notifyObservers(observers, STATE_DIRTY)
+            elif changedFlagMask:
+                notifyFlags(observers, changedFlagMask, changedFlags)
 
         return self._value
 
@@ -110,35 +154,11 @@ class Computation(Owner):
 
         self._state = state
         observers = self._observers
-        if observers is not None:
-            for o in observers:
-                o._notify(STATE_CHECK)
+        if observers:
+            notifyObservers(observers, STATE_CHECK)
 
     def _notifyFlags(self, mask, newFlags):
-        if self._state >= STATE_DIRTY:
-            return
-
-        if mask & self._handlerMask:
-            self._notify(STATE_DIRTY)
-            return
-
-        if self._state >= STATE_CHECK:
-            return
-
-        prevFlags = self._stateFlags & mask
-        deltaFlags = prevFlags ^ newFlags
-
-        if newFlags == prevFlags:
-            pass
-        elif deltaFlags & prevFlags & mask:
-            self._notify(STATE_CHECK)
-        else:
-            self._stateFlags ^= deltaFlags
-
-            observers = self._observers
-            if observers is not None:
-                for o in observers:
-                    o._notifyFlags(mask, newFlags)
+        notifyFlags((self,), mask, newFlags)
 
     def _setError(self, error):
         self.write(error, self._stateFlags | ERROR_BIT)
@@ -150,42 +170,151 @@ class Computation(Owner):
         if self._state is STATE_CLEAN:
             return
 
-        observerFlags = 0
-
-        if self._state is STATE_CHECK:
-            sources = self._sources
-            if sources:
-                for s in sources:
-                    s._updateIfNecessary()
-                    observerFlags |= s._stateFlags
-
-                    if self._state is STATE_DIRTY:
-                        break
-
-        if self._state is STATE_DIRTY:
-            update(self)
-        else:
-            self.write(UNCHANGED, observerFlags)
-            self._state = STATE_CLEAN
+        pullUpdates(self)
 
     def _disposeNode(self):
         if self._state is STATE_DISPOSED:
             return
         if self._sources is not None:
             removeSourceObservers(self, 0)
+            if unobservedNodes and not updateDepth:
+                flushUnobserved()
 
         return super()._disposeNode()
 
+    def _unobserved(self):
+        """called once nothing observes a node with a _storeKey"""
+
     def __repr__(self):
         cls = type(self).__name__
         state = get_state_repr(self._state)
         return f"<{cls}-{self._name}-{self._id}: {self._value} ({state})>"
 
 
+def notifyObservers(observers, state):
+    """mark observers stale, and their observers as needing a check
+
+    Uses an explicit stack so that long chains don't hit the recursion limit.
+    """
+    global notifyCount
+    notifyCount += 1
+    hook = notifyHook
+    stack = [(o, state) for o in reversed(observers)]
+
+    while stack:
+        node, state = stack.pop()
+
+        if node._eager:
+            if hook is not None and node._state < state:
+                hook(node)
+            node._notify(state)
+            continue
+
+        if node._state >= state:
+            continue
+
+        if hook is not None:
+            hook(node)
+        node._state = state
+        observers = node._observers
+        if observers:
+            for o in reversed(observers):
+                stack.append((o, STATE_CHECK))
+
+
+def notifyFlags(observers, mask, newFlags):
+    global notifyCount
+    notifyCount += 1
+    stack = list(reversed(observers))
+
+    while stack:
+        node = stack.pop()
+
+        if node._state >= STATE_DIRTY:
+            continue
+
+        if mask & node._handlerMask:
+            node._notify(STATE_DIRTY)
+            continue
+
+        if node._state >= STATE_CHECK:
+            continue
+
+        prevFlags = node._stateFlags & mask
+        deltaFlags = prevFlags ^ newFlags
+
+        if newFlags == prevFlags:
+            continue
+
+        if deltaFlags & prevFlags & mask:
+            node._notify(STATE_CHECK)
+            continue
+
+        node._stateFlags ^= deltaFlags
+        observers = node._observers
+        if observers:
+            stack.extend(reversed(observers))
+
+
+def pullUpdates(node):
+    """bring a stale node up to date
+
+    Stale sources are checked depth first with an explicit stack,
+    each frame resumes at the source it descended into.
+    """
+    nodes = [node]
+    indices = [0]
+    flags = [0]
+
+    while nodes:
+        current = nodes[-1]
+
+        if current._state is STATE_CHECK and current._sources:
+            sources = current._sources
+            i = indices[-1]
+            observerFlags = flags[-1]
+            descended = False
+
+            while i < len(sources):
+                s = sources[i]
+                if s._state is STATE_DISPOSED:
+                    raise Exception("Tried to read a disposed computation")
+
+                if s._state is not STATE_CLEAN:
+                    indices[-1] = i
+                    flags[-1] = observerFlags
+                    nodes.append(s)
+                    indices.append(0)
+                    flags.append(0)
+                    descended = True
+                    break
+
+                observerFlags |= s._stateFlags
+                i += 1
+
+                if current._state is STATE_DIRTY:
+                    break
+
+            if descended:
+                continue
+
+            flags[-1] = observerFlags
+
+        nodes.pop()
+        indices.pop()
+        observerFlags = flags.pop()
+
+        if current._state is STATE_DIRTY:
+            update(current)
+        elif current._state is STATE_CHECK:
+            current.write(UNCHANGED, observerFlags)
+            current._state = STATE_CLEAN
+
+
 def loadingState(node: Computation):
     prevOwner = setCurrentOwner(node._parent)
 
-    def compute():
+    def compute(prev):
         track(node)
         node._updateIfNecessary()
         return bool(node._stateFlags & LOADING_BIT)
@@ -199,7 +328,7 @@ def loadingState(node: Computation):
 def errorState(node):
     prevOwner = setCurrentOwner(node._parent)
 
-    def compute():
+    def compute(prev):
         track(node)
         node._updateIfNecessary()
         return bool(node._stateFlags & ERROR_BIT)
@@ -211,17 +340,20 @@ def errorState(node):
 
 
 def track(computation):
-    global currentObserver, newSources, newSourcesIndex
+    global newSources, newSourcesIndex
 
     if currentObserver:
-        if (
-            not newSources
-            and currentObserver._sources
-            and len(currentObserver._sources) < newSourcesIndex
-            and currentObserver._sources[newSourcesIndex] is computation
-        ):
-            newSourcesIndex += 1
-        elif not newSources:
+        if not newSources:
+            sources = currentObserver._sources
+            if sources:
+                # while the observer reads the same sources in the same order
+                # we only advance the index and keep the existing edges
+                if newSourcesIndex < len(sources):
+                    if sources[newSourcesIndex] is computation:
+                        newSourcesIndex += 1
+                        return
+                if newSourcesIndex and sources[newSourcesIndex - 1] is computation:
+                    return
             newSources = [computation]
         elif computation is not newSources[-1]:
             newSources.append(computation)
@@ -229,7 +361,7 @@ def track(computation):
 
 def update(node: Computation):
     # log(f"{node}: UPDATING")
-    global newSources, newSourcesIndex, newFlags
+    global newSources, newSourcesIndex, newFlags, updateDepth
     prevSources = newSources
     prevSourcesIndex = newSourcesIndex
     prevFlags = newFlags
@@ -237,6 +369,7 @@ def update(node: Computation):
     newSources = None
     newSourcesIndex = 0
     newFlags = 0
+    updateDepth += 1
 
     try:
         node.dispose(False)
@@ -252,29 +385,23 @@ def update(node: Computation):
 
     finally:
         if newSources:
-            if node._sources:
+            sources = node._sources
+            if sources:
                 removeSourceObservers(node, newSourcesIndex)
-
-            if node._sources and newSourcesIndex > 0:
-                node._sources += [None] * newSourcesIndex
-
-                for i, s in enumerate(newSources):
-                    node._sources[newSourcesIndex + i] = s
-
+                sources.extend(newSources)
             else:
                 node._sources = newSources
+                node._sourceSlots = []
 
-            i = newSourcesIndex
-            while i < len(node._sources):
-                s = node._sources[i]
-                if not s._observers:
-                    s._observers = [node]
-                else:
-                    s._observers.append(node)
-                i += 1
+            addSourceObservers(node, newSourcesIndex)
         elif node._sources and newSourcesIndex < len(node._sources):
             removeSourceObservers(node, newSourcesIndex)
-            node._sources = node._sources[:newSourcesIndex]
+
+        # only once the outermost update has linked its sources,
+        # an enclosing computation may have read a source a nested one dropped
+        updateDepth -= 1
+        if unobservedNodes and not updateDepth:
+            flushUnobserved()
 
         newSources = prevSources
         newSourcesIndex = prevSourcesIndex
@@ -283,17 +410,99 @@ def update(node: Computation):
         node._state = STATE_CLEAN
 
 
+def startBatch():
+    global batchDepth
+    batchDepth += 1
+
+
+def endBatch():
+    """returns True when the outermost batch has exited"""
+    global batchDepth
+    if batchDepth > 1:
+        batchDepth -= 1
+        return False
+
+    try:
+        runBatchedNotifications()
+    finally:
+        batchDepth = 0
+
+    return True
+
+
+def runBatchedNotifications():
+    global batchedNodes
+    while batchedNodes:
+        nodes = batchedNodes
+        batchedNodes = {}
+        for node in nodes.values():
+            observers = node._observers
+            if observers:
+                notifyObservers(observers, STATE_DIRTY)
+
+
+def flushBatched():
+    # a derived value read mid batch must see the writes
+    if batchedNodes:
+        runBatchedNotifications()
+
+
+def isBatching():
+    return batchDepth > 0
+
+
+def addSourceObservers(node, index):
+    # each edge records its slot in the other node's list
+    # so that unlinking never has to search for it
+    sources = node._sources
+    sourceSlots = node._sourceSlots
+
+    for i in range(index, len(sources)):
+        s = sources[i]
+        observers = s._observers
+        if observers is None:
+            s._observers = [node]
+            s._observerSlots = [i]
+            sourceSlots.append(0)
+        else:
+            sourceSlots.append(len(observers))
+            observers.append(node)
+            s._observerSlots.append(i)
+
+
 def removeSourceObservers(node, index):
     sources = node._sources
     if not sources:
         return
 
-    for s in sources:
+    sourceSlots = node._sourceSlots
+
+    for i in range(index, len(sources)):
+        s = sources[i]
         observers = s._observers
-        if observers:
-            swap = observers.index(node)
-            observers[swap] = observers[-1]
-            observers.pop()
+        observerSlots = s._observerSlots
+        slot = sourceSlots[i]
+
+        # swap the last observer into the vacated slot
+        last = observers.pop()
+        lastSlot = observerSlots.pop()
+        if slot < len(observers):
+            observers[slot] = last
+            observerSlots[slot] = lastSlot
+            last._sourceSlots[lastSlot] = slot
+        elif not observers and s._storeKey is not None:
+            unobservedNodes.append(s)
+
+    del sources[index:]
+    del sourceSlots[index:]
+
+
+def flushUnobserved():
+    nodes = unobservedNodes[:]
+    del unobservedNodes[:]
+    for s in nodes:
+        if not s._observers:
+            s._unobserved()
 
 
 def isEqual(a, b):
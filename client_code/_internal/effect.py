@@ -5,27 +5,25 @@
 #
 # This software is published at https://github.com/anvilistas/reactive
 
-from anvil import is_server_side
+from functools import wraps
 
+from . import core
 from .constants import STATE_CLEAN, STATE_DISPOSED
-from .core import Computation
+from .core import Computation, endBatch, isBatching, startBatch
 from .owner import handleError
+from .scheduler import IDLE, RENDER, USER, get_scheduler
 
 __version__ = "0.1.3"
 
-if is_server_side():
-
-    def queueMicrotask(fn):
-        return fn()
-
-else:
-    from anvil.js.window import queueMicrotask
-
 
 scheduledEffects = False
+scheduledIdle = False
 runningEffects = False
-renderEffects: list["RenderEffect"] = []
-effects: list["Effect"] = []
+renderEffects: list[Computation] = []
+effects: list[Computation] = []
+idleEffects: list[Computation] = []
+
+queues = {RENDER: renderEffects, USER: effects, IDLE: idleEffects}
 
 
 def flushSync():
@@ -37,14 +35,25 @@ def flushEffects():
     global scheduledEffects
     scheduledEffects = True
     # log("FLUSHING EFFECTS IN MICRO TASK")
-    queueMicrotask(runEffects)
+    get_scheduler().queue_microtask(runEffects)
 
 
-def runTop(node: Computation):
+def flushIdle():
+    global scheduledIdle
+    scheduledIdle = True
+    get_scheduler().queue_idle(runIdle)
+
+
+def runTop(node: Computation, visited=None):
     ancestors: list[Computation] = []
 
     current = node
     while current is not None:
+        if visited is not None:
+            # ancestors resolved earlier in this flush don't need walking again
+            if current._id in visited and current._state is STATE_CLEAN:
+                break
+            visited.add(current._id)
         if current._state is not STATE_CLEAN:
             ancestors.append(current)
         current = current._parent
@@ -54,55 +63,188 @@ def runTop(node: Computation):
             ancestor._updateIfNecessary()
 
 
+def byDepth(node):
+    return node._depth
+
+
+def insertByDepth(queue, node, lo):
+    """insert node into queue[lo:], after any nodes as shallow as it"""
+    depth = node._depth
+    hi = len(queue)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if depth < queue[mid]._depth:
+            hi = mid
+        else:
+            lo = mid + 1
+    queue.insert(lo, node)
+
+
+def runQueue(queue, lane, start):
+    """run the queue outermost owners first, returns True if it yielded early"""
+    scheduler = get_scheduler()
+    budget = scheduler.budgets.get(lane)
+    visited = set()
+    notified = core.notifyCount
+    queue.sort(key=byDepth)
+    i = 0
+    ordered = len(queue)
+
+    try:
+        while i < len(queue):
+            # the queue can grow while it runs, place new entries by depth
+            if ordered < len(queue):
+                added = queue[ordered:]
+                del queue[ordered:]
+                for node in added:
+                    insertByDepth(queue, node, i)
+                ordered = len(queue)
+
+            # an ancestor walked earlier may have gone stale since
+            if notified != core.notifyCount:
+                notified = core.notifyCount
+                visited.clear()
+
+            node = queue[i]
+            i += 1
+            if node._state is not STATE_CLEAN:
+                node._run(visited)
+
+            limit = budget if node._budget is None else node._budget
+            if (
+                limit is not None
+                and i < len(queue)
+                and scheduler.now() - start >= limit
+            ):
+                return True
+
+        return False
+
+    finally:
+        ran = queue[:i]
+        del queue[:i]
+        for node in ran:
+            node._commit()
+
+
 def runEffects():
-    global effects, scheduledEffects, runningEffects, renderEffects
+    global scheduledEffects, runningEffects
     # log("RUNNING EFFECTS")
 
-    if not effects and not renderEffects:
-        scheduledEffects = False
-        return
-
     runningEffects = True
+    paused = False
 
     try:
-        for r in renderEffects:
-            if r._state is not STATE_CLEAN:
-                r._updateIfNecessary()
+        start = get_scheduler().now()
+        paused = runQueue(renderEffects, RENDER, start) or runQueue(
+            effects, USER, start
+        )
 
-        for r in renderEffects:
-            if r.modified:
-                r.effect(r._value)
-                r.modified = False
-
-        for e in effects:
-            if e._state is not STATE_CLEAN:
-                runTop(e)
+    except BaseException:
+        del renderEffects[:]
+        del effects[:]
+        raise
 
     finally:
-        effects = []
-        scheduledEffects = False
         runningEffects = False
+        if paused:
+            # yield to the event loop and pick up where we left off
+            get_scheduler().queue_task(runEffects)
+        else:
+            scheduledEffects = False
+
+    if not paused and idleEffects and not scheduledIdle:
+        flushIdle()
+
+
+def runIdle():
+    global scheduledIdle
+
+    paused = False
+    try:
+        paused = runQueue(idleEffects, IDLE, get_scheduler().now())
+    except BaseException:
+        del idleEffects[:]
+        raise
+    finally:
+        if paused:
+            get_scheduler().queue_idle(runIdle)
+        else:
+            scheduledIdle = False
+
+
+def schedule(node):
+    lane = node._lane
+    queues[lane].append(node)
+
+    if isBatching():
+        return
+    if lane is IDLE:
+        if not scheduledIdle and not scheduledEffects:
+            flushIdle()
+    elif not scheduledEffects:
+        flushEffects()
+
+
+class batch:
+    """defer signal notifications until the outermost batch exits
+    use as a context manager or as a decorator
+    """
+
+    def __new__(cls, fn=None):
+        if fn is None:
+            return object.__new__(cls)
+
+        @wraps(fn)
+        def wrapper(*args, **kws):
+            with batch():
+                return fn(*args, **kws)
+
+        return wrapper
+
+    def __enter__(self):
+        startBatch()
+
+    def __exit__(self, exc, excType, *e):
+        if not endBatch():
+            return None
+        if not scheduledEffects and (effects or renderEffects):
+            flushEffects()
+        elif not scheduledIdle and not scheduledEffects and idleEffects:
+            flushIdle()
+        return None
 
 
 class Effect(Computation):
-    def __init__(self, initialValue, compute, name="effect", **options):
+    __slots__ = ["_lane", "_budget"]
+
+    _eager = True
+
+    def __init__(
+        self, initialValue, compute, name="effect", lane=USER, budget=None, **options
+    ):
+        self._lane = lane
+        self._budget = budget
         super().__init__(initialValue, compute, name=name, **options)
         self._updateIfNecessary()
-        queueMicrotask(self._updateIfNecessary)
+        get_scheduler().queue_microtask(self._updateIfNecessary)
         # effects.append(self)
 
     def _notify(self, state):
-        global effects, scheduledEffects
-
         if self._state >= state:
             return
 
-        if self._state is STATE_CLEAN:
-            effects.append(self)
-
+        wasClean = self._state is STATE_CLEAN
         self._state = state
-        if not scheduledEffects and effects:
-            flushEffects()
+
+        if wasClean:
+            schedule(self)
+
+    def _run(self, visited=None):
+        runTop(self, visited)
+
+    def _commit(self):
+        pass
 
     def write(self, value, flags=0):
         self._value = value
@@ -113,26 +255,38 @@ class Effect(Computation):
 
 
 class RenderEffect(Computation):
-    def __init__(self, compute, effect, name="renderEffect", **options):
+    __slots__ = ["modified", "effect", "_lane", "_budget"]
+
+    _eager = True
+
+    def __init__(
+        self, compute, effect, name="renderEffect", lane=RENDER, budget=None, **options
+    ):
         self.modified = False
         self.effect = effect
+        self._lane = lane
+        self._budget = budget
         super().__init__(None, compute, name=name, **options)
         self._updateIfNecessary()
         # renderEffects.append(self)
 
     def _notify(self, state):
-        global renderEffects, scheduledEffects
-
         if self._state >= state:
             return
 
-        if self._state is STATE_CLEAN:
-            renderEffects.append(self)
-
+        wasClean = self._state is STATE_CLEAN
         self._state = state
 
-        if not scheduledEffects and renderEffects:
-            flushEffects()
+        if wasClean:
+            schedule(self)
+
+    def _run(self, visited=None):
+        self._updateIfNecessary()
+
+    def _commit(self):
+        if self.modified:
+            self.modified = False
+            self.effect(self._value)
 
     def write(self, value, flags=0):
         self._value = value
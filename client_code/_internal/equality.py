@@ -0,0 +1,154 @@
+# SPDX-License-Identifier: MIT
+#
+# Copyright (c) 2023-2025 Anvilistas project team members listed at
+# https://github.com/anvilistas/reactive/graphs/contributors
+#
+# This software is published at https://github.com/anvilistas/reactive
+
+from . import core
+
+__version__ = "0.1.3"
+
+DEEP_MAX_SIZE = 1000
+
+# raw access, so comparing reactive containers doesn't track their items
+dict_items = dict.items
+dict_get = dict.get
+list_iter = list.__iter__
+lengths = {dict: dict.__len__, list: list.__len__, tuple: len}
+
+
+def identical(a, b):
+    return a is b
+
+
+def equal(a, b):
+    if a is b:
+        return True
+    try:
+        return bool(a == b)
+    except Exception:
+        return False
+
+
+def raw(value):
+    """the value in a store signal, reactive containers hold observed items in them"""
+    return value._value if isinstance(value, core.Computation) else value
+
+
+def containerType(value):
+    if isinstance(value, dict):
+        return dict
+    if isinstance(value, list):
+        return list
+    if isinstance(value, tuple):
+        return tuple
+    if isinstance(value, (set, frozenset)):
+        return set
+    return None
+
+
+def shallow_equal(a, b):
+    """== except for lists, tuples and dicts
+
+    These are equal when their items are identical or equal scalars.
+    """
+    a, b = raw(a), raw(b)
+    if a is b:
+        return True
+
+    T = containerType(a)
+    if T is None or T is set or T is not containerType(b):
+        # a reactive container is equal to the plain one it was made from
+        return type(a) is type(b) and equal(a, b)
+
+    length = lengths[T]
+    if length(a) != length(b):
+        return False
+
+    if T is dict:
+        items = dict_items(a)
+        for key, value in items:
+            other = dict_get(b, key, items)
+            if other is items or not scalarEqual(value, other):
+                return False
+        return True
+
+    if T is list:
+        a, b = list_iter(a), list_iter(b)
+    for x, y in zip(a, b):
+        if not scalarEqual(x, y):
+            return False
+    return True
+
+
+def scalarEqual(a, b):
+    a, b = raw(a), raw(b)
+    if a is b:
+        return True
+    T = type(a)
+    if T is not type(b):
+        return False
+    if T is str or T is int or T is float or T is bool or T is bytes:
+        return a == b
+    return False
+
+
+def deep_equal(a, b, max_size=DEEP_MAX_SIZE):
+    """structural equality through dicts, lists, tuples and sets
+
+    Comparing stops at max_size items and the values are treated as different,
+    so a large structure can't make every write expensive.
+    """
+    stack = [(a, b)]
+    size = 0
+
+    while stack:
+        a, b = stack.pop()
+        a, b = raw(a), raw(b)
+        if a is b:
+            continue
+
+        T = containerType(a)
+        if T is None or T is set or T is not containerType(b):
+            if type(a) is not type(b) or not equal(a, b):
+                return False
+            continue
+
+        length = lengths[T]
+        size += length(a)
+        if size > max_size or length(a) != length(b):
+            return False
+
+        if T is dict:
+            items = dict_items(a)
+            for key, value in items:
+                other = dict_get(b, key, items)
+                if other is items:
+                    return False
+                stack.append((value, other))
+        elif T is list:
+            stack.extend(zip(list_iter(a), list_iter(b)))
+        else:
+            stack.extend(zip(a, b))
+
+    return True
+
+
+strategies = {
+    "identity": identical,
+    "equal": equal,
+    "shallow": shallow_equal,
+    "deep": deep_equal,
+}
+
+
+def getEquals(equals):
+    """resolve a named strategy, anything else is returned as is"""
+    if type(equals) is str:
+        try:
+            return strategies[equals]
+        except KeyError:
+            names = ", ".join(map(repr, strategies))
+            raise ValueError(f"equals should be one of {names} or a function")
+    return equals
@@ -0,0 +1,116 @@
+# SPDX-License-Identifier: MIT
+#
+# Copyright (c) 2023-2025 Anvilistas project team members listed at
+# https://github.com/anvilistas/reactive/graphs/contributors
+#
+# This software is published at https://github.com/anvilistas/reactive
+
+from anvil import is_server_side
+
+from .constants import STATE_DISPOSED
+from .core import Computation
+
+__version__ = "0.1.3"
+
+# tracking swaps an instrumented Computation.__init__ onto the class,
+# so there is no overhead while it is disabled
+originalInit = Computation.__init__
+
+enabled = False
+# keyed by _id, store signals hash and compare by their value
+# weakref and gc are CPython only, so they are imported when tracking starts
+live = {}
+
+
+def collect():
+    if live:
+        import gc
+
+        gc.collect()
+
+
+def trackedInit(self, *args, **kws):
+    originalInit(self, *args, **kws)
+    live[self._id] = self
+
+
+def enable_leak_tracking():
+    """Track every computation created from now on, for use in server side tests"""
+    global enabled, live
+    if not is_server_side():
+        raise ImportError("leak tracking needs weakref, which is server side only")
+    from weakref import WeakValueDictionary
+
+    if not enabled:
+        live = WeakValueDictionary()
+    Computation.__init__ = trackedInit
+    enabled = True
+
+
+def disable_leak_tracking():
+    """Stop tracking new computations and forget the ones already tracked"""
+    global enabled
+    Computation.__init__ = originalInit
+    live.clear()
+    enabled = False
+
+
+def is_tracking_leaks():
+    return enabled
+
+
+def live_nodes():
+    collect()
+    return [node for node in list(live.values()) if node._state is not STATE_DISPOSED]
+
+
+def live_counts():
+    """Return {name: count} of tracked computations not yet disposed or collected"""
+    counts = {}
+    for node in live_nodes():
+        counts[node._name] = counts.get(node._name, 0) + 1
+    return counts
+
+
+def leaked_since(baseline):
+    """Return {name: extra} for names with more live computations than in baseline
+
+    e.g. take live_counts() before opening a form and check nothing leaked after
+    it has been removed
+    """
+    leaked = {}
+    for name, count in live_counts().items():
+        extra = count - baseline.get(name, 0)
+        if extra > 0:
+            leaked[name] = extra
+    return leaked
+
+
+def disposedOwner(node):
+    owner = node._parent
+    while owner is not None:
+        if owner._state is STATE_DISPOSED:
+            return owner
+        owner = owner._parent
+    return None
+
+
+def find_orphans():
+    """Return [(computation, reason)] for tracked computations still observing a
+    signal that their owner can no longer dispose
+
+    reason is "disposed" for a disposed computation left in a source's observers
+    and "owner disposed" for a live computation whose owner has been disposed.
+    """
+    orphans = []
+    collect()
+    for node in list(live.values()):
+        sources = node._sources
+        if not sources:
+            continue
+        if node._state is STATE_DISPOSED:
+            if any(o is node for s in sources for o in s._observers or ()):
+                orphans.append((node, "disposed"))
+        elif disposedOwner(node) is not None:
+            orphans.append((node, "owner disposed"))
+    return orphans
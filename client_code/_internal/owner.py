@@ -5,10 +5,15 @@
 #
 # This software is published at https://github.com/anvilistas/reactive
 
+from anvil import is_server_side
+
 from .constants import STATE_CLEAN, STATE_DISPOSED
 
 __version__ = "0.1.3"
 
+# owners can only be weakly referenced on the server, for the leak tracker
+WEAKREF_SLOTS = ["__weakref__"] if is_server_side() else []
+
 HANDLER = object()
 
 currentOwner = None  # type: Owner | None
@@ -29,6 +34,18 @@ id = 0
 
 
 class Owner:
+    __slots__ = [
+        "_id",
+        "_name",
+        "_parent",
+        "_nextSibling",
+        "_prevSibling",
+        "_state",
+        "_disposal",
+        "_context",
+        "_depth",
+    ] + WEAKREF_SLOTS
+
     def __init__(self, signal=False, name=None):
         global id
         self._id = id
@@ -40,12 +57,14 @@ class Owner:
         self._state = STATE_CLEAN
         self._disposal = None
         self._context = None
+        self._depth = 0
         if currentOwner and not signal:
             currentOwner.append(self)
         # log(f"creating {id}")
 
     def append(self, owner: "Owner"):
         owner._parent = self
+        owner._depth = self._depth + 1
         owner._prevSibling = self
         if self._nextSibling:
             self._nextSibling._prevSibling = owner
@@ -0,0 +1,123 @@
+# SPDX-License-Identifier: MIT
+#
+# Copyright (c) 2023-2025 Anvilistas project team members listed at
+# https://github.com/anvilistas/reactive/graphs/contributors
+#
+# This software is published at https://github.com/anvilistas/reactive
+
+from . import core
+from .scheduler import now
+
+__version__ = "0.1.3"
+
+# profiling swaps an instrumented core.update into the core module and sets
+# core.notifyHook, so there is next to no overhead while it is disabled
+originalUpdate = core.update
+
+enabled = False
+stats = {}
+# time spent in nested updates, so each run can report its own time
+childTimes = []
+
+
+class NodeStats:
+    __slots__ = ["runs", "total", "own", "max", "notified"]
+
+    def __init__(self):
+        self.runs = 0
+        self.total = 0
+        self.own = 0
+        self.max = 0
+        self.notified = 0
+
+    def as_dict(self):
+        return {attr: getattr(self, attr) for attr in self.__slots__}
+
+
+def statsFor(node):
+    name = node._name
+    s = stats.get(name)
+    if s is None:
+        s = stats[name] = NodeStats()
+    return s
+
+
+def profiledUpdate(node):
+    childTimes.append(0)
+    start = now()
+    try:
+        originalUpdate(node)
+    finally:
+        elapsed = now() - start
+        nested = childTimes.pop()
+        if childTimes:
+            childTimes[-1] += elapsed
+
+        s = statsFor(node)
+        s.runs += 1
+        s.total += elapsed
+        s.own += elapsed - nested
+        if elapsed > s.max:
+            s.max = elapsed
+
+
+def countNotified(node):
+    statsFor(node).notified += 1
+
+
+def enable_profiling(reset=True):
+    """Start recording run counts, compute times and notifications per node name"""
+    global enabled
+    if reset:
+        reset_profile()
+    core.update = profiledUpdate
+    core.notifyHook = countNotified
+    enabled = True
+
+
+def disable_profiling():
+    """Stop recording, the collected stats are kept until reset_profile is called"""
+    global enabled
+    core.update = originalUpdate
+    core.notifyHook = None
+    enabled = False
+
+
+def is_profiling():
+    return enabled
+
+
+def reset_profile():
+    stats.clear()
+    del childTimes[:]
+
+
+def get_profile():
+    """Return {name: {runs, total, own, max, notified}}, times in milliseconds
+
+    total includes time spent updating sources that were read while computing,
+    own excludes it.
+    """
+    return {name: s.as_dict() for name, s in stats.items()}
+
+
+COLUMNS = ["runs", "total", "own", "max", "notified"]
+
+
+def profile_table(sort="total", limit=None):
+    """Return the profile as a text table, sorted by the given column"""
+    if sort not in COLUMNS:
+        raise ValueError(f"sort should be one of {COLUMNS}, got {sort!r}")
+
+    rows = sorted(stats.items(), key=lambda item: getattr(item[1], sort), reverse=True)
+    if limit is not None:
+        rows = rows[:limit]
+
+    width = max([len("name")] + [len(name) for name, _ in rows])
+    lines = [f"{'name':<{width}}" + "".join(f"{col:>10}" for col in COLUMNS)]
+    for name, s in rows:
+        lines.append(
+            f"{name:<{width}}"
+            f"{s.runs:>10}{s.total:>10.3f}{s.own:>10.3f}{s.max:>10.3f}{s.notified:>10}"
+        )
+    return "\n".join(lines)
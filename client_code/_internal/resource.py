@@ -0,0 +1,326 @@
+# SPDX-License-Identifier: MIT
+#
+# Copyright (c) 2023-2025 Anvilistas project team members listed at
+# https://github.com/anvilistas/reactive/graphs/contributors
+#
+# This software is published at https://github.com/anvilistas/reactive
+
+from .constants import STATE_DISPOSED
+from .core import UNCHANGED, Computation, untrack
+from .effect import Effect
+from .flags import ERROR_BIT, LOADING_BIT
+from .owner import onCleanup
+from .scheduler import RENDER, get_scheduler
+
+__version__ = "0.1.3"
+
+NO_SOURCE = object()
+
+# requests in flight, keyed by (fetcher, key), each with the callbacks waiting on it
+inflight = {}
+
+
+def request(fetcher, key, done, run):
+    """call fetcher off the reactive path, sharing the call with identical requests"""
+    try:
+        requestKey = (fetcher, key)
+        hash(requestKey)
+    except TypeError:
+        requestKey = None
+
+    if requestKey is not None:
+        waiting = inflight.get(requestKey)
+        if waiting is not None:
+            waiting.append(done)
+            return
+        inflight[requestKey] = [done]
+
+    def job():
+        try:
+            value = fetcher() if key is NO_SOURCE else fetcher(key)
+            error = None
+        except Exception as e:
+            value, error = None, e
+
+        callbacks = inflight.pop(requestKey, None) if requestKey else [done]
+        for callback in callbacks or ():
+            callback(value, error)
+
+    run(job)
+
+
+class CacheEntry:
+    __slots__ = ["value", "fetched", "pending", "listeners", "run"]
+
+    def __init__(self):
+        self.value = None
+        # when the value was fetched, None until it has been
+        self.fetched = None
+        self.pending = False
+        self.listeners = []
+        # how the last subscriber runs fetches
+        self.run = None
+
+
+class ResourceCache:
+    """Shares fetched values between resources, keyed by fetcher and key
+
+    A value is fresh for ttl milliseconds. After that it is still served while it
+    is fetched again in the background, and listeners get the new value when it
+    arrives. At most max_size entries are kept, the least recently used entries
+    that no resource is showing are evicted first. Errors are never cached.
+    """
+
+    def __init__(self, ttl=0, max_size=100):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, fetcher_key):
+        return fetcher_key in self._entries
+
+    def _get(self, cacheKey):
+        entries = self._entries
+        entry = entries.pop(cacheKey, None)
+        if entry is None:
+            entry = CacheEntry()
+        # reinserting keeps the dict in least recently used order
+        entries[cacheKey] = entry
+        if len(entries) > self.max_size:
+            self._evict()
+        return entry
+
+    def _evict(self):
+        entries = self._entries
+        excess = len(entries) - self.max_size
+        for cacheKey, entry in list(entries.items()):
+            if excess <= 0:
+                break
+            if not entry.listeners and not entry.pending:
+                del entries[cacheKey]
+                excess -= 1
+
+    def _revalidate(self, fetcher, key, entry, run):
+        if entry.pending:
+            return
+        entry.pending = True
+
+        def done(value, error):
+            entry.pending = False
+            if error is None:
+                entry.value = value
+                entry.fetched = get_scheduler().now()
+            else:
+                entry.fetched = None
+                if not entry.listeners:
+                    self._entries.pop((fetcher, key), None)
+            for listener in list(entry.listeners):
+                listener(value, error)
+
+        request(fetcher, key, done, run or get_scheduler().queue_task)
+
+    def subscribe(self, fetcher, key, listener, run=None):
+        """Call listener(value, error) with the cached value and every new one
+
+        Returns (unsubscribe, served), served is False when there is no value yet
+        and the listener has to wait for the fetch.
+        """
+        try:
+            cacheKey = (fetcher, key)
+            hash(cacheKey)
+        except TypeError:
+            # unhashable keys can't be shared
+            request(fetcher, key, listener, run or get_scheduler().queue_task)
+            return None, False
+
+        entry = self._get(cacheKey)
+        entry.listeners.append(listener)
+        entry.run = run
+
+        def unsubscribe():
+            if listener in entry.listeners:
+                entry.listeners.remove(listener)
+
+        served = entry.fetched is not None
+        if served:
+            listener(entry.value, None)
+            if get_scheduler().now() - entry.fetched >= self.ttl:
+                self._revalidate(fetcher, key, entry, run)
+        else:
+            self._revalidate(fetcher, key, entry, run)
+
+        return unsubscribe, served
+
+    def invalidate(self, fetcher=None, key=NO_SOURCE, run=None):
+        """Mark entries stale, those shown by a resource are fetched again now
+
+        With no arguments every entry is invalidated,
+        with just a fetcher every entry for that fetcher.
+        """
+        for (f, k), entry in list(self._entries.items()):
+            if fetcher is not None and f is not fetcher:
+                continue
+            if key is not NO_SOURCE and k != key:
+                continue
+            if entry.listeners:
+                if entry.fetched is not None:
+                    # keep serving the value but no longer as fresh
+                    stale = get_scheduler().now() - self.ttl
+                    entry.fetched = min(entry.fetched, stale)
+                self._revalidate(f, k, entry, run or entry.run)
+            elif not entry.pending:
+                del self._entries[(f, k)]
+
+    def invalidate_on(self, deps, fetcher=None):
+        """Invalidate whenever the signals read by deps() change
+
+        Returns a function that stops listening, it also stops with the current owner.
+        """
+        first = True
+
+        def watch(prev):
+            nonlocal first
+            deps()
+            if first:
+                first = False
+            else:
+                with untrack():
+                    self.invalidate(fetcher)
+
+        node = Effect(None, watch, name="cache invalidation", lane=RENDER)
+        return node.dispose
+
+    def clear(self):
+        self._entries.clear()
+
+
+class Resource:
+    """The value of an async fetch, read by calling it
+
+    While a fetch is pending the previous value is kept and loading() is True,
+    wait() raises NotReadyError instead.
+    """
+
+    __slots__ = [
+        "_node",
+        "_tracker",
+        "_fetcher",
+        "_run",
+        "_cache",
+        "_unsubscribe",
+        "_key",
+        "_seq",
+    ]
+
+    def __init__(
+        self, source, fetcher, initial_value=None, run=None, cache=None, name=None
+    ):
+        self._node = Computation(initial_value, None, name=name or "resource")
+        self._fetcher = fetcher
+        self._run = run
+        self._cache = cache
+        self._unsubscribe = None
+        self._tracker = None
+        self._key = NO_SOURCE
+        self._seq = 0
+
+        def load(prev):
+            key = NO_SOURCE if source is NO_SOURCE else source()
+            with untrack():
+                self._load(key)
+            return key
+
+        self._tracker = Effect(None, load, name="resource source", lane=RENDER)
+        onCleanup(self._stop)
+
+    def _stop(self):
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+    def _load(self, key):
+        node = self._node
+        self._stop()
+        self._key = key
+        self._seq += 1
+        seq = self._seq
+
+        if key is None or key is False:
+            # nothing to fetch, e.g. no record selected yet
+            node.write(UNCHANGED, node._stateFlags & ~LOADING_BIT)
+            return
+
+        def done(value, error):
+            tracker = self._tracker
+            if seq != self._seq or (tracker and tracker._state is STATE_DISPOSED):
+                # the source has changed since, or the resource is gone
+                return
+            flags = node._stateFlags & ~(LOADING_BIT | ERROR_BIT)
+            if error is not None:
+                node.write(error, flags | ERROR_BIT)
+            else:
+                node.write(value, flags)
+
+        cache = self._cache
+        if cache is not None:
+            self._unsubscribe, served = cache.subscribe(
+                self._fetcher, key, done, self._run
+            )
+            if not served:
+                node.write(UNCHANGED, node._stateFlags | LOADING_BIT)
+            return
+
+        node.write(UNCHANGED, node._stateFlags | LOADING_BIT)
+        request(self._fetcher, key, done, self._run or get_scheduler().queue_task)
+
+    def __call__(self):
+        return self._node.read()
+
+    def read(self):
+        return self._node.read()
+
+    def wait(self):
+        return self._node.wait()
+
+    def loading(self):
+        return self._node.loading()
+
+    def error(self):
+        return self._node.error()
+
+    @property
+    def latest(self):
+        """the current value without tracking"""
+        return self._node._value
+
+    def refetch(self):
+        """fetch again for the current source value"""
+        if self._cache is not None:
+            self._node.write(UNCHANGED, self._node._stateFlags | LOADING_BIT)
+            self._cache.invalidate(self._fetcher, self._key, self._run)
+        else:
+            self._load(self._key)
+
+    def mutate(self, value):
+        """set the value locally, e.g. for an optimistic update"""
+        self._node.write(value, self._node._stateFlags & ~ERROR_BIT)
+
+
+def create_resource(
+    source, fetcher=None, initial_value=None, run=None, cache=None, name=None
+):
+    """Fetch a value off the reactive path whenever source changes
+
+    fetcher(key) is called with the value of source, or with no arguments
+    when it is the only argument. It isn't called while the key is None or False.
+    run(job) schedules the call, by default as a new task so anvil.server.call
+    doesn't block the UI. Only the response for the latest key is kept and
+    identical requests in flight share a single call.
+    Pass a ResourceCache to share values between resources.
+    """
+    if fetcher is None:
+        source, fetcher = NO_SOURCE, source
+    return Resource(source, fetcher, initial_value, run, cache, name)
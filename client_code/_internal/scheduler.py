@@ -0,0 +1,82 @@
+# SPDX-License-Identifier: MIT
+#
+# Copyright (c) 2023-2025 Anvilistas project team members listed at
+# https://github.com/anvilistas/reactive/graphs/contributors
+#
+# This software is published at https://github.com/anvilistas/reactive
+
+from time import perf_counter
+
+from anvil import is_server_side
+
+__version__ = "0.1.3"
+
+RENDER = "render"
+USER = "user"
+IDLE = "idle"
+
+LANES = (RENDER, USER, IDLE)
+
+if is_server_side():
+
+    def queueMicrotask(fn):
+        return fn()
+
+    def setTimeout(fn, delay=0):
+        return fn()
+
+    requestIdleCallback = None
+
+    def now():
+        return perf_counter() * 1000
+
+else:
+    from anvil.js import window
+    from anvil.js.window import performance, queueMicrotask, setTimeout
+
+    requestIdleCallback = getattr(window, "requestIdleCallback", None)
+
+    def now():
+        return performance.now()
+
+
+class Scheduler:
+    """Decides when queued effects are flushed
+
+    Effects are queued in lanes, render effects first, then user effects,
+    with idle effects flushed once the browser is idle.
+    A lane with a budget (in milliseconds) yields back to the event loop
+    once it has run for longer than its budget and resumes in a new task.
+    A budget of None runs the lane to completion.
+    Subclass and pass an instance to set_scheduler to change any of this.
+    """
+
+    def __init__(self, budget=None, render_budget=None, idle_budget=5):
+        self.budgets = {RENDER: render_budget, USER: budget, IDLE: idle_budget}
+
+    def now(self):
+        return now()
+
+    def queue_microtask(self, fn):
+        queueMicrotask(fn)
+
+    def queue_task(self, fn):
+        setTimeout(fn, 0)
+
+    def queue_idle(self, fn):
+        if requestIdleCallback is None:
+            self.queue_task(fn)
+        else:
+            requestIdleCallback(lambda deadline: fn())
+
+
+scheduler = Scheduler()
+
+
+def set_scheduler(new_scheduler):
+    global scheduler
+    scheduler = new_scheduler
+
+
+def get_scheduler():
+    return scheduler
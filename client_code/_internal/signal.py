@@ -5,16 +5,18 @@
 #
 # This software is published at https://github.com/anvilistas/reactive
 
-from .core import Computation, compute
+from .constants import STATE_CLEAN, STATE_DISPOSED
+from .core import Computation, compute, flushBatched, getObserver
 from .effect import Effect, RenderEffect
 from .helpers import is_callable
 from .owner import HANDLER, Owner, handleError
+from .scheduler import RENDER
 
 __version__ = "0.1.3"
 
 
-def create_signal(initial_value):
-    node = Computation(initial_value, None)
+def create_signal(initial_value, equals=None):
+    node = Computation(initial_value, None, equals=equals)
 
     def set_signal(v):
         if is_callable(v):
@@ -25,37 +27,108 @@ def create_signal(initial_value):
     return [node.read, set_signal]
 
 
-def create_memo(compute, initialValue=None, name=None):
-    node = Computation(initialValue, compute, name=name or "memo")
+def create_memo(compute, initialValue=None, name=None, equals=None):
+    """equals - "identity", "equal", "shallow", "deep" or a function (prev, next)
+
+    Decides whether a recomputed value has changed and should notify observers.
+    """
+    node = Computation(initialValue, compute, name=name or "memo", equals=equals)
     return node.read
 
 
 SENTINEL = object()
 
 
-def create_effect(effect, initialValue=SENTINEL, name=None):
+def create_effect(effect, initialValue=SENTINEL, name=None, **options):
+    """options - lane ("render", "user" or "idle") and budget in milliseconds"""
+
     def wrap_effect(value=None):
         return effect()
 
     if initialValue is not SENTINEL:
         wrap_effect = effect
 
-    return Effect(initialValue, wrap_effect, name=name)
+    return Effect(initialValue, wrap_effect, name=name, **options)
 
 
-def create_render_effect(compute, effect):
+def create_render_effect(compute, effect, **options):
     def wrap_effect(value=None):
         return effect()
 
     def wrap_compute(value=None):
         return compute()
 
-    return RenderEffect(wrap_compute, wrap_effect)
+    return RenderEffect(wrap_compute, wrap_effect, **options)
 
 
 # TODO should these be suspension wrapped?
 
 
+class SelectedSignal(Computation):
+    __slots__ = ["_storeKey"]
+
+    def __init__(self, value, subs, key):
+        super().__init__(value, None, name="selected")
+        self._storeKey = (subs, key)
+
+    def _unobserved(self):
+        subs, key = self._storeKey
+        if subs.get(key) is self:
+            del subs[key]
+
+
+def create_selector(source, equals=None):
+    """Returns is_selected(key), true when key matches the current value of source
+
+    Each key observed through is_selected gets its own signal, so a change of
+    source only notifies observers of the keys that stopped or started matching.
+    equals(key, value) replaces ==, it is then checked for every observed key.
+    """
+    subs = {}
+    selecting = False
+
+    def select(prev):
+        nonlocal selecting
+        value = source()
+        if not subs:
+            return value
+
+        selecting = True
+        try:
+            if equals is not None:
+                for key, sig in list(subs.items()):
+                    sig.write(bool(equals(key, value)))
+            elif prev != value:
+                for key in (prev, value):
+                    sig = subs.get(key)
+                    if sig is not None:
+                        sig.write(key == value)
+        finally:
+            selecting = False
+        return value
+
+    node = Effect(SENTINEL, select, name="selector", lane=RENDER)
+
+    def is_selected(key):
+        # the selector may not have run yet if source changed since the last flush
+        flushBatched()
+        state = node._state
+        if state is not STATE_CLEAN and state is not STATE_DISPOSED and not selecting:
+            node._updateIfNecessary()
+
+        value = node._value
+        if getObserver() is None:
+            return bool(equals(key, value)) if equals else key == value
+
+        sig = subs.get(key)
+        if sig is None:
+            selected = bool(equals(key, value)) if equals else key == value
+            sig = subs[key] = SelectedSignal(selected, subs, key)
+        return sig.read()
+
+    return is_selected
+
+
 def create_root(init):
     owner = Owner()
 
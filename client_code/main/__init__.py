@@ -6,12 +6,36 @@
 # This software is published at https://github.com/anvilistas/reactive
 
 # ruff: noqa: F401
-from .._internal.signal import create_effect
+from .._internal.effect import batch
+from .._internal.equality import deep_equal, shallow_equal
+from .._internal.leaks import (
+    disable_leak_tracking,
+    enable_leak_tracking,
+    find_orphans,
+    leaked_since,
+    live_counts,
+)
+from .._internal.profile import (
+    disable_profiling,
+    enable_profiling,
+    get_profile,
+    profile_table,
+    reset_profile,
+)
+from .._internal.resource import ResourceCache, create_resource
+from .._internal.scheduler import Scheduler, set_scheduler
+from .._internal.signal import create_effect, create_selector
+from ._aggregate import count_of, group_by, max_of, min_of, sum_of
+from ._array import index_array, map_array
+from ._graph import graph_to_dot, graph_to_json, snapshot_graph
 from ._primitives import bind, computed, effect, render_effect, writeback
 from ._reactive_class import reactive_class, reactive_instance
+from ._reconcile import reconcile
 from ._signal import signal
 from ._store import ReactiveDict as reactive_dict
 from ._store import ReactiveList as reactive_list
+from ._table import ReactiveTable as reactive_table
+from ._views import filtered_view, sorted_view
 
 __version__ = "0.1.3"
 
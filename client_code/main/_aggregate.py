@@ -0,0 +1,347 @@
+# SPDX-License-Identifier: MIT
+#
+# Copyright (c) 2023-2025 Anvilistas project team members listed at
+# https://github.com/anvilistas/reactive/graphs/contributors
+#
+# This software is published at https://github.com/anvilistas/reactive
+
+from heapq import heapify, heappop, heappush
+
+from .._internal.constants import STATE_CLEAN, STATE_DIRTY, STATE_DISPOSED
+from .._internal.core import Computation
+from .._internal.owner import onCleanup, setCurrentOwner
+from ._store import INSERT, MOVE, REMOVE, RESET, ReactiveList, read_value
+
+__version__ = "0.1.3"
+
+list_iter = list.__iter__
+
+
+def identity(value):
+    return value
+
+
+class Watcher(Computation):
+    """Computes key(item) for one list item and reports when it goes stale
+
+    Watchers are not owned by the computation that creates them,
+    the collection disposes them as items are removed.
+    """
+
+    __slots__ = ["_collection", "_counted", "_item", "_index"]
+
+    _eager = True
+
+    def __init__(self, collection, item, key):
+        self._collection = collection
+        self._counted = False
+        self._item = item
+        self._index = 0
+        prevOwner = setCurrentOwner(None)
+        try:
+            super().__init__(None, lambda prev: key(read_value(item)), name="watcher")
+        finally:
+            setCurrentOwner(prevOwner)
+
+    def _notify(self, state):
+        if self._state >= state:
+            return
+        wasClean = self._state is STATE_CLEAN
+        self._state = state
+        if wasClean:
+            self._collection._stale(self)
+
+
+class WatchedList:
+    """Keeps one watcher per item of a ReactiveList and applies their changes
+
+    Subclasses implement _add(value) and _remove(value) to keep a running result
+    and _result() to publish it. Changes are applied when the result is next read,
+    so each read costs the number of changed items, not the size of the list.
+    """
+
+    __slots__ = ["_source", "_watchers", "_pending", "_key", "_node"]
+
+    def __init__(self, source, key=None, name="aggregate"):
+        if not isinstance(source, ReactiveList):
+            raise TypeError(f"expected a reactive_list, not {type(source).__name__}")
+        self._source = source
+        self._key = key or identity
+        self._watchers = []
+        self._pending = []
+        self._node = self._createNode(name)
+        self._insert(0, list(list_iter(source)))
+        source.subscribe(self._changed)
+        onCleanup(self._dispose)
+
+    def _createNode(self, name):
+        return Computation(None, self._apply, name=name)
+
+    def _stale(self, watcher):
+        self._pending.append(watcher)
+        node = self._node
+        if node._state is not STATE_DIRTY:
+            node._notify(STATE_DIRTY)
+
+    def _queue(self, watchers):
+        # one notification for the lot, an eager node may run as soon as it is told
+        self._pending.extend(watchers)
+        node = self._node
+        if watchers and node._state is not STATE_DIRTY:
+            node._notify(STATE_DIRTY)
+
+    def _insert(self, index, items):
+        watchers = [Watcher(self, item, self._key) for item in items]
+        self._watchers[index:index] = watchers
+        self._queue(watchers)
+
+    def _removeWatchers(self, watchers):
+        for watcher in watchers:
+            if watcher._counted:
+                self._remove(watcher._value)
+            watcher.dispose()
+        if watchers and self._node._state is not STATE_DIRTY:
+            self._node._notify(STATE_DIRTY)
+
+    def _removeRange(self, start, stop):
+        removed = self._watchers[start:stop]
+        del self._watchers[start:stop]
+        self._removeWatchers(removed)
+
+    def _move(self, order):
+        watchers = self._watchers
+        self._watchers = [watchers[j] for j in order]
+
+    def _reset(self):
+        # nothing says what changed, so start again from the current items
+        self._removeRange(0, len(self._watchers))
+        self._insert(0, list(list_iter(self._source)))
+
+    def _changed(self, change):
+        op = change.op
+        if op is INSERT:
+            self._insert(change.index, change.items)
+        elif op is REMOVE:
+            self._removeRange(change.index, change.index + change.count)
+        elif op is MOVE:
+            self._move(change.order)
+        elif op is RESET:
+            self._reset()
+        # replace writes the item's signal, which its watcher sees
+
+    def _apply(self, prev):
+        pending = self._pending
+        self._pending = []
+        for watcher in pending:
+            if watcher._state is STATE_DISPOSED:
+                continue
+            if watcher._counted:
+                old = watcher._value
+                watcher._updateIfNecessary()
+                self._remove(old)
+            else:
+                watcher._updateIfNecessary()
+                watcher._counted = True
+            self._add(watcher._value)
+        return self._result()
+
+    def _dispose(self):
+        for watcher in self._watchers:
+            watcher.dispose()
+        self._watchers = []
+        self._pending = []
+
+    def read(self):
+        return self._node.read()
+
+
+def accumulate(total, error, value):
+    """Returns total + value and the rounding error accumulated so far
+
+    Neumaier's compensated summation, so a running float total doesn't drift from
+    the sum of its values however many updates it has been through. ints are exact.
+    """
+    new = total + value
+    if type(new) is float:
+        if abs(total) >= abs(value):
+            error += (total - new) + value
+        else:
+            error += (value - new) + total
+    return new, error
+
+
+class Sum(WatchedList):
+    __slots__ = ["_total", "_error"]
+
+    def __init__(self, source, key=None):
+        self._total = 0
+        self._error = 0
+        super().__init__(source, key, name="sum")
+
+    def _add(self, value):
+        self._total, self._error = accumulate(self._total, self._error, value)
+
+    def _remove(self, value):
+        self._total, self._error = accumulate(self._total, self._error, -value)
+
+    def _result(self):
+        return self._total + self._error
+
+
+class Count(WatchedList):
+    __slots__ = ["_count"]
+
+    def __init__(self, source, predicate=None):
+        self._count = 0
+        super().__init__(source, predicate or (lambda item: True), name="count")
+
+    def _add(self, value):
+        if value:
+            self._count += 1
+
+    def _remove(self, value):
+        if value:
+            self._count -= 1
+
+    def _result(self):
+        return self._count
+
+
+class Reversed:
+    __slots__ = ["value"]
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+
+class Extreme(WatchedList):
+    """min or max with a heap, removed values are dropped from the top lazily"""
+
+    __slots__ = ["_counts", "_heap", "_reverse", "_default"]
+
+    def __init__(self, source, key=None, reverse=False, default=None):
+        self._counts = {}
+        self._heap = []
+        self._reverse = reverse
+        self._default = default
+        super().__init__(source, key, name="max" if reverse else "min")
+
+    def _add(self, value):
+        if value is None:
+            return
+        counts = self._counts
+        count = counts.get(value, 0)
+        counts[value] = count + 1
+        if not count:
+            heappush(self._heap, Reversed(value) if self._reverse else value)
+
+    def _remove(self, value):
+        if value is None:
+            return
+        counts = self._counts
+        count = counts[value] - 1
+        if count:
+            counts[value] = count
+        else:
+            del counts[value]
+
+    def _result(self):
+        heap = self._heap
+        counts = self._counts
+        reverse = self._reverse
+
+        if len(heap) > 2 * len(counts) + 16:
+            # values that come and go leave copies behind, so rebuild now and then
+            heap[:] = [Reversed(v) for v in counts] if reverse else list(counts)
+            heapify(heap)
+
+        while heap:
+            top = heap[0].value if reverse else heap[0]
+            if top in counts:
+                return top
+            heappop(heap)
+        return self._default
+
+
+class GroupBy(WatchedList):
+    __slots__ = ["_groups"]
+
+    def __init__(self, source, key, value=None):
+        self._groups = {}
+        if value is None:
+
+            def group_key(item):
+                return (key(item), 1)
+
+        else:
+
+            def group_key(item):
+                return (key(item), value(item))
+
+        super().__init__(source, group_key, name="group_by")
+
+    def _add(self, pair):
+        group, value = pair
+        entry = self._groups.get(group)
+        if entry is None:
+            # total, count and rounding error
+            self._groups[group] = [value, 1, 0]
+        else:
+            entry[0], entry[2] = accumulate(entry[0], entry[2], value)
+            entry[1] += 1
+
+    def _remove(self, pair):
+        group, value = pair
+        entry = self._groups[group]
+        if entry[1] == 1:
+            del self._groups[group]
+        else:
+            entry[0], entry[2] = accumulate(entry[0], entry[2], -value)
+            entry[1] -= 1
+
+    def _result(self):
+        return {group: entry[0] + entry[2] for group, entry in self._groups.items()}
+
+
+def sum_of(source, key=None):
+    """Returns a getter for the sum of key(item) over a reactive list
+
+    Only items that were added, removed or changed since the last read are visited.
+    """
+    return Sum(source, key).read
+
+
+def count_of(source, predicate=None):
+    """Returns a getter for the number of items in a reactive list matching predicate"""
+    return Count(source, predicate).read
+
+
+def min_of(source, key=None, default=None):
+    """Returns a getter for the smallest key(item) in a reactive list
+
+    None values are skipped, default is returned when there are no values.
+    """
+    return Extreme(source, key, default=default).read
+
+
+def max_of(source, key=None, default=None):
+    """Returns a getter for the largest key(item) in a reactive list
+
+    None values are skipped, default is returned when there are no values.
+    """
+    return Extreme(source, key, reverse=True, default=default).read
+
+
+def group_by(source, key, value=None):
+    """Returns a getter for {key(item): total} over a reactive list
+
+    total is the sum of value(item) over the group, or its size when value is None.
+    Each change costs O(1) to apply, reading copies the dict of groups.
+    """
+    return GroupBy(source, key, value).read
@@ -0,0 +1,148 @@
+# SPDX-License-Identifier: MIT
+#
+# Copyright (c) 2023-2025 Anvilistas project team members listed at
+# https://github.com/anvilistas/reactive/graphs/contributors
+#
+# This software is published at https://github.com/anvilistas/reactive
+
+from .._internal.core import Computation, compute
+from .._internal.owner import Owner, onCleanup, setCurrentOwner
+
+__version__ = "0.1.3"
+
+
+def default_key(item):
+    try:
+        hash(item)
+    except TypeError:
+        return id(item)
+    return item
+
+
+def read_source(source):
+    items = source() if callable(source) else source
+    if items is None:
+        return []
+    return list(items)
+
+
+class Mapped:
+    __slots__ = ["owner", "item", "index", "value"]
+
+    def __init__(self, parent, item, index, fn):
+        # items are not children of the mapping computation
+        # so that re-running it doesn't dispose every item
+        prevOwner = setCurrentOwner(None)
+        self.owner = Owner()
+        setCurrentOwner(prevOwner)
+        self.owner._parent = parent
+        self.owner._depth = parent._depth + 1
+        self.item = item
+        self.index = index
+        self.value = compute(self.owner, lambda prev: fn(), None)
+
+    def dispose(self):
+        self.owner.dispose()
+
+
+def map_array(source, fn, key=None):
+    """map a list to a list of mapped values, one owner per item
+
+    source is a reactive list or a getter returning a list
+    fn is called as fn(item, index) where index is a getter for the item's position
+    key(item) identifies an item across updates, e.g. lambda row: row["id"]
+    With a key, item is a getter for the latest item with that key, so an item
+    refetched as a new object updates what reads it rather than calling fn again.
+    Without a key an item is only kept while it is the same object.
+
+    Items that keep their key keep their mapped value,
+    removed items have their owner disposed and only new or replaced items call fn.
+    Returns a getter for the mapped list.
+    """
+    getKey = key or default_key
+    entries = {}
+
+    def dispose_all():
+        for bucket in entries.values():
+            for entry in bucket:
+                entry.dispose()
+        entries.clear()
+
+    onCleanup(dispose_all)
+
+    def map_items(prev):
+        nonlocal entries
+        prevEntries = entries
+        entries = {}
+        mapped = []
+
+        for i, item in enumerate(read_source(source)):
+            k = getKey(item)
+            bucket = prevEntries.get(k)
+            entry = bucket.pop(0) if bucket else None
+
+            if entry is not None and key is None and entry.item is not item:
+                entry.dispose()
+                entry = None
+
+            if entry is None:
+                index = Computation(i, None, name="index")
+                if key is None:
+                    entry = Mapped(node, item, index, lambda: fn(item, index.read))
+                else:
+                    signal = Computation(item, None, name="item")
+                    entry = Mapped(
+                        node, signal, index, lambda: fn(signal.read, index.read)
+                    )
+            else:
+                entry.index.write(i)
+                if key is not None:
+                    entry.item.write(item)
+
+            entries.setdefault(k, []).append(entry)
+            mapped.append(entry.value)
+
+        for bucket in prevEntries.values():
+            for entry in bucket:
+                entry.dispose()
+
+        return mapped
+
+    node = Computation([], map_items, name="map_array")
+    return node.read
+
+
+def index_array(source, fn):
+    """map a list to a list of mapped values, one owner per index
+
+    fn is called as fn(item, index) where item is a getter for the value at index
+    When the value at an index changes only computations reading item re-run.
+    Returns a getter for the mapped list.
+    """
+    entries = []
+
+    def dispose_all():
+        for entry in entries:
+            entry.dispose()
+        entries.clear()
+
+    onCleanup(dispose_all)
+
+    def map_items(prev):
+        items = read_source(source)
+
+        for i, item in enumerate(items):
+            if i < len(entries):
+                entries[i].item.write(item)
+            else:
+                signal = Computation(item, None, name="item")
+                entries.append(Mapped(node, signal, i, lambda: fn(signal.read, i)))
+
+        for entry in entries[len(items) :]:
+            entry.dispose()
+        del entries[len(items) :]
+
+        return [entry.value for entry in entries]
+
+    node = Computation([], map_items, name="index_array")
+    return node.read
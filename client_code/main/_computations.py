@@ -14,6 +14,8 @@ __version__ = "0.1.3"
 
 
 class UniqueSignal(Computation):
+    __slots__ = []
+
     def __init__(self, name=None):
         super().__init__(0, None, equals=False, name=name or "unique")
 
@@ -36,8 +38,15 @@ def _cmp(dunder):
 
 @portable_class
 class StoreSignal(Computation):
-    def __init__(self, val, name=None):
-        super().__init__(val, None, name=name)
+    __slots__ = ["_storeKey"]
+
+    def __init__(self, val, name=None, equals=None):
+        super().__init__(val, None, name=name, equals=equals)
+        self._storeKey = None
+
+    def _unobserved(self):
+        store, key = self._storeKey
+        store._reclaim(key, self)
 
     def __hash__(self):
         return hash(self._value)
@@ -0,0 +1,174 @@
+# SPDX-License-Identifier: MIT
+#
+# Copyright (c) 2023-2025 Anvilistas project team members listed at
+# https://github.com/anvilistas/reactive/graphs/contributors
+#
+# This software is published at https://github.com/anvilistas/reactive
+
+import json
+
+from .._internal.constants import get_state_repr
+from .._internal.core import Computation
+from .._internal.effect import Effect, RenderEffect
+from .._internal.owner import Owner
+from ._primitives import REACTIVE_CACHE
+from ._store import ReactiveDict, ReactiveList
+
+__version__ = "0.1.3"
+
+list_iter = list.__iter__
+dict_values = dict.values
+
+
+def node_kind(node):
+    if isinstance(node, RenderEffect):
+        return "render_effect"
+    if isinstance(node, Effect):
+        return "effect"
+    if isinstance(node, Computation):
+        return "signal" if node._compute is None else "memo"
+    return "owner"
+
+
+def store_nodes(store):
+    if isinstance(store, ReactiveDict):
+        signals = store.DICT_SIGNALS or {}
+        yield from signals.values()
+        for val in dict_values(store):
+            if isinstance(val, Computation):
+                yield val
+        yield store.DICT_KEYS
+        yield store.DICT_VALS
+        yield store.DICT_ITEMS
+        yield store.DICT_BOOL
+    else:
+        for val in list_iter(store):
+            if isinstance(val, Computation):
+                yield val
+        yield store.LIST_LEN
+        yield store.LIST_BOOL
+
+
+def target_nodes(target):
+    """the owners and computations a snapshot starts from"""
+    if isinstance(target, Owner):
+        yield target
+        return
+
+    node = getattr(target, "__self__", None)
+    if isinstance(node, Computation):
+        # e.g. the getter returned by create_memo
+        yield node
+        return
+
+    if isinstance(target, (ReactiveDict, ReactiveList)):
+        yield from store_nodes(target)
+        return
+
+    # a reactive instance: its computations and its attribute signals
+    rcs = REACTIVE_CACHE.get(target)
+    if rcs is not None:
+        for rc in rcs.values():
+            if isinstance(rc, (Owner, Computation)):
+                yield rc
+            else:
+                node = getattr(rc, "__self__", None)
+                if isinstance(node, Computation):
+                    yield node
+
+    attrs = getattr(target, "__dict__", None)
+    if isinstance(attrs, ReactiveDict):
+        yield from store_nodes(attrs)
+
+
+def owned(owner):
+    """owners created under owner, in creation order"""
+    inside = {owner._id}
+    current = owner._nextSibling
+    while current is not None and current._parent is not None:
+        if current._parent._id not in inside:
+            break
+        inside.add(current._id)
+        yield current
+        current = current._nextSibling
+
+
+def snapshot_graph(*targets):
+    """Snapshot the graph reachable from roots, computations or reactive objects
+
+    Follows the owner tree down from each owner and the source/observer edges
+    in both directions. Returns a dict of json friendly nodes and edges.
+    Nodes are {id, name, kind, state, depth, owner, fan_in, fan_out}
+    where fan_in counts sources and fan_out counts observers.
+    Edges are [source_id, observer_id].
+    """
+    # nodes are keyed by _id since StoreSignals hash and compare by value
+    seen = {}
+    stack = []
+    for target in targets:
+        stack.extend(n for n in target_nodes(target) if n is not None)
+
+    while stack:
+        node = stack.pop()
+        if node._id in seen:
+            continue
+        seen[node._id] = node
+
+        if not isinstance(node, Computation) or node._compute is not None:
+            stack.extend(owned(node))
+
+        if isinstance(node, Computation):
+            stack.extend(node._sources or ())
+            stack.extend(node._observers or ())
+
+    nodes = []
+    edges = []
+    for id, node in sorted(seen.items()):
+        sources = observers = ()
+        if isinstance(node, Computation):
+            sources = node._sources or ()
+            observers = node._observers or ()
+        parent = node._parent
+        nodes.append(
+            {
+                "id": id,
+                "name": node._name,
+                "kind": node_kind(node),
+                "state": get_state_repr(node._state),
+                "depth": node._depth,
+                "owner": parent._id if parent is not None else None,
+                "fan_in": len(sources),
+                "fan_out": len(observers),
+            }
+        )
+        edges.extend([s._id, id] for s in sources)
+
+    return {"nodes": nodes, "edges": edges}
+
+
+def graph_to_json(graph, **kws):
+    """Serialize a snapshot, kws are passed to json.dumps"""
+    return json.dumps(graph, **kws)
+
+
+def graph_to_dot(graph, name="reactive"):
+    """Render a snapshot as a graphviz digraph
+
+    Dependency edges are solid and point from source to observer,
+    ownership edges are dashed and point from owner to owned.
+    """
+    lines = [f"digraph {name} {{", "  node [shape=box, fontsize=10];"]
+    ids = set()
+    for node in graph["nodes"]:
+        ids.add(node["id"])
+        title = str(node["name"]).replace('"', '\\"')
+        label = f"{title}\\n{node['kind']} {node['state']}"
+        label += f"\\nin {node['fan_in']} out {node['fan_out']}"
+        lines.append(f'  n{node["id"]} [label="{label}"];')
+    for source, observer in graph["edges"]:
+        lines.append(f"  n{source} -> n{observer};")
+    for node in graph["nodes"]:
+        if node["owner"] in ids:
+            lines.append(f"  n{node['owner']} -> n{node['id']} [style=dashed];")
+    lines.append("}")
+    return "\n".join(lines)
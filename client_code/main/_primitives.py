@@ -11,6 +11,7 @@ import anvil
 from anvil import Component
 
 from .._internal.core import untrack
+from .._internal.scheduler import RENDER
 from .._internal.signal import create_effect, create_memo, create_root
 from ._constants import MISSING
 from ._utils import CacheDict, noop
@@ -94,14 +95,16 @@ class ReactiveComputation:
     _type = ""
     _creator = noop
     _property = False
+    _options = {}
 
-    def __new__(cls, fn=None, *, init_value=MISSING):
+    def __new__(cls, fn=None, *, init_value=MISSING, **options):
         if fn is None:
-            return lambda fn: cls(fn, init_value=init_value)
+            return lambda fn: cls(fn, init_value=init_value, **options)
         self = object.__new__(cls)
         self.fn = fn
         self._prev = init_value is not MISSING
         self._init_value = init_value if self._prev else None
+        self.options = {**cls._options, **options}
         self.creator = type(self)._creator
         return self
 
@@ -154,13 +157,18 @@ class ReactiveComputation:
         self.name = f"{self._type}-{name}"
 
     def create(self, obj):
-        return self.creator(self.get_compute(obj), self._init_value, name=self.name)
+        return self.creator(
+            self.get_compute(obj), self._init_value, name=self.name, **self.options
+        )
 
     def __call__(self, obj):
         return self.__get__(obj)()
 
 
 class computed(ReactiveComputation):
+    """options - equals ("identity", "equal", "shallow", "deep" or a function)"""
+
+    _type = "computed"
     _creator = create_memo
 
     def _fn_compute(self, obj, ob_type=None):
@@ -182,11 +190,16 @@ class computed(ReactiveComputation):
 
 
 class effect(ReactiveComputation):
+    """options - lane ("render", "user" or "idle") and budget in milliseconds"""
+
+    _type = "effect"
     _creator = create_effect
 
 
 class render_effect(ReactiveComputation):
+    _type = "render_effect"
     _creator = create_effect
+    _options = {"lane": RENDER}
 
 
 class MethodLike:
@@ -9,7 +9,7 @@ import anvil
 
 from ._computations import StoreSignal
 from ._constants import MISSING
-from ._store import ReactiveDict
+from ._store import EagerReactiveDict
 from ._utils import is_testing
 
 __version__ = "0.1.3"
@@ -139,7 +139,7 @@ def reactive_class(base):
         except AttributeError:
             pass
         else:
-            object.__setattr__(self, "__dict__", ReactiveDict(old_dict))
+            object.__setattr__(self, "__dict__", EagerReactiveDict(old_dict))
             old_dict.clear()
         return self
 
@@ -193,7 +193,7 @@ def reactive_instance(self):
 
     d = getattr(self, "__dict__", None)
     if type(d) is dict:
-        object.__setattr__(self, "__dict__", ReactiveDict(d))
+        object.__setattr__(self, "__dict__", EagerReactiveDict(d))
 
     override_slot_values(self)
 
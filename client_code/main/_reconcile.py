@@ -0,0 +1,182 @@
+# SPDX-License-Identifier: MIT
+#
+# Copyright (c) 2023-2025 Anvilistas project team members listed at
+# https://github.com/anvilistas/reactive/graphs/contributors
+#
+# This software is published at https://github.com/anvilistas/reactive
+
+from .._internal.core import isEqual, untrack
+from .._internal.effect import batch
+from .._internal.equality import deep_equal
+from ._constants import MISSING
+from ._store import (
+    REPLACE,
+    ReactiveDict,
+    ReactiveList,
+    as_lazy_signal,
+    raw_value,
+    wrap_lazy,
+)
+
+__version__ = "0.1.3"
+
+dict_get = dict.get
+dict_pop = dict.pop
+list_get = list.__getitem__
+list_len = list.__len__
+list_iter = list.__iter__
+
+NO_LIMIT = float("inf")
+
+
+def unchanged(current, new):
+    if isEqual(current, new):
+        return True
+    if type(current) is not type(new):
+        return False
+    # plain dicts and lists that nothing has looked inside yet are compared whole
+    return deep_equal(current, new, NO_LIMIT)
+
+
+def patch(current, new, key):
+    """reconcile current with new in place if they are the same kind of container
+
+    Returns True when current now matches new, False when it has to be replaced.
+    """
+    if isinstance(current, ReactiveDict):
+        if type(new) is not dict:
+            return False
+        patch_dict(current, new, key)
+        return True
+    if isinstance(current, ReactiveList):
+        if type(new) is not list:
+            return False
+        patch_list(current, new, key)
+        return True
+    return unchanged(current, new)
+
+
+def patch_dict(target, new, key):
+    changes = []
+    for k, value in new.items():
+        current = raw_value(dict_get(target, k, MISSING))
+        if current is not MISSING and patch(current, value, key):
+            continue
+        change = target._set(k, value)
+        if change is not None:
+            changes.append(change)
+    stale = [k for k in dict.keys(target) if k not in new]
+    removed = [(k, dict_pop(target, k)) for k in stale]
+    target._notify(changes, removed)
+
+
+def patch_item(target, index, sig, value, key):
+    prev = sig._value
+    if patch(prev, value, key):
+        return
+    value = wrap_lazy(value)
+    sig.write(value)
+    if target.LIST_SUBSCRIBERS:
+        target._emit(REPLACE, index, [sig], [prev])
+
+
+def item_key(key, value):
+    if type(key) is str:
+        if isinstance(value, dict):
+            return raw_value(dict_get(value, key))
+        return None
+    return key(value)
+
+
+def patch_positions(target, new):
+    n, m = list_len(target), len(new)
+    for i in range(min(n, m)):
+        patch_item(target, i, list_get(target, i), new[i], None)
+    if m > n:
+        target._splice(n, 0, [as_lazy_signal(v) for v in new[n:]])
+    elif m < n:
+        target._splice(m, n - m)
+
+
+def patch_list(target, new, key):
+    # key is for this list's items, lists nested inside them match by position
+    if key is None:
+        return patch_positions(target, new)
+
+    newKeys = [item_key(key, value) for value in new]
+    oldKeys = [item_key(key, sig._value) for sig in list_iter(target)]
+    if not any(k is not None for k in newKeys + oldKeys):
+        # e.g. a list of scalars
+        return patch_positions(target, new)
+
+    # match items by key, each existing signal is reused at most once
+    available = {}
+    for sig, k in zip(list_iter(target), oldKeys):
+        if k is not None:
+            available.setdefault(k, []).append(sig)
+    for sigs in available.values():
+        sigs.reverse()
+
+    signals = []
+    for k in newKeys:
+        sigs = available.get(k) if k is not None else None
+        signals.append(sigs.pop() if sigs else None)
+
+    matched = [sig is not None for sig in signals]
+    kept = {id(sig) for sig in signals if sig is not None}
+
+    # remove what isn't kept, from the end so indices stay valid
+    i = list_len(target)
+    while i > 0:
+        i -= 1
+        if id(list_get(target, i)) in kept:
+            continue
+        stop = i + 1
+        while i > 0 and id(list_get(target, i - 1)) not in kept:
+            i -= 1
+        target._splice(i, stop - i)
+
+    # put the kept items in their new order
+    positions = {id(sig): j for j, sig in enumerate(list_iter(target))}
+    order = [positions[id(sig)] for sig in signals if sig is not None]
+    if order != sorted(order):
+        target._reorder(order)
+
+    # then insert the new items in runs
+    i = 0
+    while i < len(signals):
+        if signals[i] is not None:
+            i += 1
+            continue
+        start = i
+        while i < len(signals) and signals[i] is None:
+            i += 1
+        signals[start:i] = [as_lazy_signal(v) for v in new[start:i]]
+        target._splice(start, 0, signals[start:i])
+
+    # finally the values of the items that were kept
+    for index, (sig, value) in enumerate(zip(signals, new)):
+        if matched[index]:
+            patch_item(target, index, sig, value, None)
+
+
+def reconcile(target, new_data, key=None):
+    """Update a reactive_dict or reactive_list in place to match plain data
+
+    Nested dicts and lists are diffed too, only the values that changed are
+    written, so observers of unchanged data don't re-run. Lists are matched by
+    position, or by key when given, either the name of a dict key, e.g. "id",
+    or a function of the item. key applies to the first lists reached,
+    lists inside their items and lists of items without keys match by position.
+    Items without a key in a keyed list are always replaced.
+    Returns target.
+    """
+    if not isinstance(target, (ReactiveDict, ReactiveList)):
+        raise TypeError(
+            f"expected a reactive_dict or reactive_list, not {type(target).__name__}"
+        )
+    with batch(), untrack():
+        if not patch(target, new_data, key):
+            expected = "dict" if isinstance(target, ReactiveDict) else "list"
+            raise TypeError(f"can't reconcile a reactive {expected} with {new_data!r}")
+    return target
@@ -12,9 +12,16 @@ __version__ = "0.1.3"
 
 
 class signal:
-    def __init__(self, default=None, *, default_factory=MISSING):
+    """A reactive attribute of a reactive_class
+
+    A dict or list assigned to it is wrapped as a reactive_dict or reactive_list,
+    nested containers are kept by reference until first read, see ReactiveDict.
+    """
+
+    def __init__(self, default=None, *, default_factory=MISSING, equals=None):
         self._default = default
         self._default_factory = default_factory
+        self._equals = equals
 
     def __set_name__(self, owner, name):
         self._name = name
@@ -27,10 +34,10 @@ class signal:
                 value = self._default_factory()
             else:
                 value = self._default
-            node = as_signal(value, name=self._name)
+            node = as_signal(value, name=self._name, equals=self._equals)
             dict.__setitem__(d, self._name, node)
         elif type(node) is not StoreSignal:
-            node = as_signal(node, name=self._name)
+            node = as_signal(node, name=self._name, equals=self._equals)
             dict.__setitem__(d, self._name, node)
 
         return node
@@ -9,6 +9,8 @@ from anvil import is_server_side
 from anvil.server import portable_class
 
 from .._internal.core import Computation, getObserver, isEqual, untrack
+from .._internal.effect import batch
+from .._internal.owner import onCleanup
 from ._computations import StoreSignal, UniqueSignal
 from ._constants import MISSING
 
@@ -23,7 +25,7 @@ def wrap(val):
         return ReactiveList(val)
 
     if type(val) is StoreSignal:
-        return val._value
+        return materialize(val)
 
     d = getattr(val, "__dict__", None)
 
@@ -35,8 +37,33 @@ def wrap(val):
     return val
 
 
-def as_signal(val, name=None):
-    return StoreSignal(wrap(val), name)
+def wrap_lazy(val):
+    """like wrap but nested containers are left to be wrapped when first read"""
+    T = type(val)
+    if T is dict or T is list:
+        return val
+    return wrap(val)
+
+
+def materialize(sig):
+    val = sig._value
+    T = type(val)
+    if T is dict or T is list:
+        val = sig._value = wrap(val)
+    return val
+
+
+def read_value(sig):
+    sig.read()
+    return materialize(sig)
+
+
+def as_signal(val, name=None, equals=None):
+    return StoreSignal(wrap(val), name, equals)
+
+
+def as_lazy_signal(val):
+    return StoreSignal(wrap_lazy(val))
 
 
 dict_getitem = dict.__getitem__
@@ -45,8 +72,26 @@ dict_pop = dict.pop
 dict_get = dict.get
 
 
+def raw_value(val):
+    if type(val) is StoreSignal:
+        return val._value
+    return val
+
+
 @portable_class
 class ReactiveDict(dict):
+    """A dict whose reads are tracked and whose writes notify observers
+
+    Values are stored as is until a key is first read by an observer.
+    Per-key and structural signals are only created once something observes them
+    and per-key signals are dropped again once nothing observes them.
+
+    A dict or list assigned in is copied one level deep, the dicts and lists
+    nested inside it are kept by reference and only copied into reactive
+    containers when first read. So don't mutate a payload after assigning it,
+    changes to its nested containers would show up without notifying anyone.
+    """
+
     __slots__ = [
         "DICT_SIGNALS",
         "DICT_KEYS",
@@ -55,49 +100,169 @@ class ReactiveDict(dict):
         "DICT_BOOL",
     ]
 
+    _eager = False
+
     def __init__(self, *args, **kws):
-        self.DICT_KEYS = UniqueSignal("dict_keys")
-        self.DICT_VALS = UniqueSignal("dict_vals")
-        self.DICT_ITEMS = UniqueSignal("dict_items")
-        self.DICT_BOOL = Computation(bool(dict.__len__(self)), None)
-        self.DICT_SIGNALS = {}
-        self.update(*args, **kws)
+        self.DICT_KEYS = None
+        self.DICT_VALS = None
+        self.DICT_ITEMS = None
+        self.DICT_BOOL = None
+        self.DICT_SIGNALS = None
+
+        for k, v in dict(*args, **kws).items():
+            if self._eager:
+                self._key_signal(k, wrap(v))
+            else:
+                dict_setitem(self, k, wrap_lazy(v))
+
+    def _key_signal(self, key, val):
+        signals = self.DICT_SIGNALS
+        if signals is None:
+            signals = self.DICT_SIGNALS = {}
+
+        sig = signals.get(key)
+        if sig is None:
+            sig = signals[key] = StoreSignal(val)
+            if not self._eager:
+                sig._storeKey = (self, key)
+
+        if val is not MISSING:
+            # from now on the value lives in the signal
+            dict_setitem(self, key, sig)
+
+        return sig
+
+    def _reclaim(self, key, sig):
+        # the signal is unobserved, so the value can go back to being stored as is
+        signals = self.DICT_SIGNALS
+        if signals is None or signals.get(key) is not sig:
+            return
+        del signals[key]
+        sig._storeKey = None
+        if dict_get(self, key, MISSING) is sig:
+            dict_setitem(self, key, sig._value)
+
+    def _materialize(self, key, val):
+        if type(val) is StoreSignal:
+            return materialize(val)
+
+        T = type(val)
+        if T is dict or T is list:
+            val = wrap(val)
+            dict_setitem(self, key, val)
+        return val
+
+    def _track_keys(self):
+        if getObserver() is None:
+            return
+        if self.DICT_KEYS is None:
+            self.DICT_KEYS = UniqueSignal("dict_keys")
+        self.DICT_KEYS.read()
+
+    def _track_vals(self):
+        if getObserver() is None:
+            return
+        if self.DICT_VALS is None:
+            self.DICT_VALS = UniqueSignal("dict_vals")
+        self.DICT_VALS.read()
+
+    def _track_items(self):
+        if getObserver() is None:
+            return
+        if self.DICT_ITEMS is None:
+            self.DICT_ITEMS = UniqueSignal("dict_items")
+        self.DICT_ITEMS.read()
+
+    def _track_bool(self):
+        if getObserver() is None:
+            return
+        if self.DICT_BOOL is None:
+            self.DICT_BOOL = Computation(bool(dict.__len__(self)), None)
+        self.DICT_BOOL.read()
 
     def _update_signals(self, keys=True):
         if keys:
-            self.DICT_KEYS.update()
-            self.DICT_BOOL.write(bool(dict.__len__(self)))
-        self.DICT_VALS.update()
-        self.DICT_ITEMS.update()
+            if self.DICT_KEYS is not None:
+                self.DICT_KEYS.update()
+            if self.DICT_BOOL is not None:
+                self.DICT_BOOL.write(bool(dict.__len__(self)))
+        if self.DICT_VALS is not None:
+            self.DICT_VALS.update()
+        if self.DICT_ITEMS is not None:
+            self.DICT_ITEMS.update()
 
     def __getitem__(self, key):
         val = dict_get(self, key, MISSING)
 
+        if type(val) is StoreSignal:
+            return read_value(val)
+
+        val = self._materialize(key, val)
+
         if getObserver():
-            c = self.DICT_SIGNALS.setdefault(key, StoreSignal(val))
-            c.read()
+            self._key_signal(key, val).read()
 
         if val is MISSING:
             raise KeyError(key)
 
-        return val.read()
+        return val
 
-    def __setitem__(self, key, val):
+    def _set(self, key, val):
+        """store val without notifying anyone
+
+        Returns None when nothing changed, otherwise (added, sig, val)
+        where sig, if there is one, still has to be written with val.
+        """
         current = dict_get(self, key, MISSING)
 
         val = wrap(val)
 
         if type(current) is StoreSignal:
+            sig = current
             current = current._value
+        else:
+            signals = self.DICT_SIGNALS
+            sig = None if signals is None else signals.get(key)
 
-        if isEqual(current, val):
+        # compare the way the value's signal will, e.g. with a signal's equals=
+        equals = isEqual if sig is None else sig._equals
+        if equals is not False and equals(current, val):
             # nothing has changed
+            return None
+
+        if sig is None and self._eager:
+            sig = self._key_signal(key, current)
+
+        dict_setitem(self, key, val if sig is None else sig)
+        return current is MISSING, sig, val
+
+    def _clear_signal(self, key, sig):
+        sig.write(MISSING)  # force observers to re-run
+        if not sig._observers and sig._storeKey is not None:
+            self._reclaim(key, sig)
+
+    def _notify(self, changes, removed=()):
+        """notify once for a batch of _set changes and removed (key, value) pairs"""
+        if not changes and not removed:
             return
+        with batch():
+            added = bool(removed) or any(change[0] for change in changes)
+            self._update_signals(keys=added)
+            for _, sig, val in changes:
+                if sig is not None:
+                    sig.write(val)
+            for key, val in removed:
+                if type(val) is StoreSignal:
+                    self._clear_signal(key, val)
 
-        sig = self.DICT_SIGNALS.setdefault(key, StoreSignal(current))
-        dict_setitem(self, key, sig)
-        self._update_signals(keys=current is MISSING)
-        sig.write(val)
+    def __setitem__(self, key, val):
+        change = self._set(key, val)
+        if change is None:
+            return
+        added, sig, val = change
+        self._update_signals(keys=added)
+        if sig is not None:
+            sig.write(val)
 
     def __delitem__(self, key):
         self.pop(key)
@@ -110,12 +275,24 @@ class ReactiveDict(dict):
             return False
 
     def update(self, *args, **kws):
-        for k, v in dict(*args, **kws).items():
-            self[k] = v
+        """Set many keys, observers of the dict as a whole are notified once"""
+        changes = [self._set(k, v) for k, v in dict(*args, **kws).items()]
+        self._notify([change for change in changes if change is not None])
+
+    def replace_all(self, *args, **kws):
+        """Make the dict equal to dict(*args, **kws), notifying once
+
+        Keys that keep their value are left alone, so their observers don't re-run.
+        """
+        new = dict(*args, **kws)
+        stale = [k for k in dict.keys(self) if k not in new]
+        removed = [(k, dict_pop(self, k)) for k in stale]
+        changes = [self._set(k, v) for k, v in new.items()]
+        self._notify([change for change in changes if change is not None], removed)
 
     def clear(self):
-        for k in list(dict.keys(self)):
-            self.pop(k)
+        if dict.__len__(self):
+            self.replace_all()
 
     def pop(self, key, default=MISSING):
         if default is MISSING:
@@ -126,8 +303,11 @@ class ReactiveDict(dict):
                 return default
 
         self._update_signals()
-        rv = res._value
-        res.write(MISSING)  # force observers to re-run
+        if type(res) is not StoreSignal:
+            return wrap(res)
+
+        rv = materialize(res)
+        self._clear_signal(key, res)
         return rv
 
     def get(self, key, default=None):
@@ -145,28 +325,28 @@ class ReactiveDict(dict):
         return iter(self.keys())
 
     def __len__(self):
-        self.DICT_KEYS.read()
+        self._track_keys()
         return dict.__len__(self)
 
     def __bool__(self):
-        self.DICT_BOOL.read()
+        self._track_bool()
         return bool(dict.__len__(self))
 
     def keys(self):
-        self.DICT_KEYS.read()
+        self._track_keys()
         return dict.keys(self)
 
     def values(self):
-        self.DICT_VALS.read()
-        return [v._value for v in dict.values(self)]
+        self._track_vals()
+        return [self._materialize(k, v) for k, v in list(dict.items(self))]
 
     def items(self):
-        self.DICT_ITEMS.read()
-        return [(k, v._value) for k, v in dict.items(self)]
+        self._track_items()
+        return [(k, self._materialize(k, v)) for k, v in list(dict.items(self))]
 
     def __repr__(self):
-        self.DICT_ITEMS.read()
-        d = {k: v._value for k, v in dict.items(self)}
+        self._track_items()
+        d = {k: raw_value(v) for k, v in dict.items(self)}
         return f"ReactiveDict({d})"
 
     def __serialize__(self, gbl_data):
@@ -180,76 +360,263 @@ class ReactiveDict(dict):
         return ReactiveDict(data)
 
 
+@portable_class
+class EagerReactiveDict(ReactiveDict):
+    """A ReactiveDict that always stores its values in signals
+
+    Used as the __dict__ of reactive instances,
+    since attribute lookups read the stored value directly.
+    """
+
+    __slots__ = []
+
+    _eager = True
+
+    @staticmethod
+    def __new_deserialized__(data, gbl_data):
+        if is_server_side():
+            return dict(data)
+        return EagerReactiveDict(data)
+
+
 list_get = list.__getitem__
 list_set = list.__setitem__
 list_len = list.__len__
 list_iter = list.__iter__
 
+INSERT = "insert"
+REMOVE = "remove"
+REPLACE = "replace"
+MOVE = "move"
+RESET = "reset"
+
+
+class ListChange:
+    """A structural change to a ReactiveList
+
+    insert - items were inserted at index
+    remove - items were removed from index
+    replace - the item at index was given a new value, old holds the previous values
+    move - the list was reordered, order[i] is the previous index of the item now at i
+    reset - the list changed in a way that no single record describes
+    """
+
+    __slots__ = ["op", "index", "items", "old", "order"]
+
+    def __init__(self, op, index=0, items=(), old=None, order=None):
+        self.op = op
+        self.index = index
+        self.items = items
+        self.old = old
+        self.order = order
+
+    @property
+    def count(self):
+        return len(self.items)
+
+    @property
+    def values(self):
+        return [materialize(sig) for sig in self.items]
+
+    def __repr__(self):
+        return f"<ListChange {self.op} at {self.index}: {self.count} items>"
+
+
+def clamp_index(i, n):
+    if i < 0:
+        i += n
+    return min(max(i, 0), n)
+
 
 @portable_class
 class ReactiveList(list):
-    __slots__ = ["LIST_LEN", "LIST_BOOL"]
+    __slots__ = ["LIST_LEN", "LIST_BOOL", "LIST_SUBSCRIBERS"]
 
     def __init__(self, *args, **kws):
         target = list(*args, **kws)
-        list.__init__(self, (as_signal(v) for v in target))
+        list.__init__(self, (as_lazy_signal(v) for v in target))
         self.LIST_LEN = UniqueSignal("list_len")
         self.LIST_BOOL = Computation(bool(list.__len__(self)), None)
+        self.LIST_SUBSCRIBERS = None
 
     def _update_len(self):
         self.LIST_LEN.update()
         self.LIST_BOOL.write(bool(list.__len__(self)))
 
+    def _emit(self, op, index=0, items=(), old=None, order=None):
+        change = ListChange(op, index, items, old, order)
+        for callback in list(self.LIST_SUBSCRIBERS):
+            callback(change)
+
+    def subscribe(self, callback):
+        """call callback with a ListChange after every structural change
+
+        Returns a function that removes the subscription.
+        Subscriptions made inside a computation are removed when it is cleaned up.
+        """
+        if self.LIST_SUBSCRIBERS is None:
+            self.LIST_SUBSCRIBERS = []
+        self.LIST_SUBSCRIBERS.append(callback)
+
+        def unsubscribe():
+            subscribers = self.LIST_SUBSCRIBERS
+            if subscribers and callback in subscribers:
+                subscribers.remove(callback)
+
+        onCleanup(unsubscribe)
+        return unsubscribe
+
+    def _splice(self, index, remove=0, items=()):
+        """replace remove signals at index with the signals in items"""
+        stop = index + remove
+        removed = list_get(self, slice(index, stop)) if remove else ()
+        list_set(self, slice(index, stop), items)
+        if self.LIST_SUBSCRIBERS:
+            if removed:
+                self._emit(REMOVE, index, removed)
+            if items:
+                self._emit(INSERT, index, list(items))
+        self._update_len()
+
+    def _reorder(self, order):
+        items = list(list_iter(self))
+        list_set(self, slice(None), [items[j] for j in order])
+        if self.LIST_SUBSCRIBERS:
+            self._emit(MOVE, order=order)
+        self._update_len()
+
+    def splice(self, index, remove=0, items=()):
+        """Remove remove items at index and insert items there, returns the removed
+
+        Observers of the list's length are notified once.
+        """
+        index = clamp_index(index, list_len(self))
+        removed = list_get(self, slice(index, index + remove))
+        signals = [as_lazy_signal(v) for v in items]
+        if removed or signals:
+            self._splice(index, len(removed), signals)
+        return [materialize(sig) for sig in removed]
+
+    def assign_from(self, values):
+        """Make the list hold values, keeping the item signals already there
+
+        Items whose value changes are written in place, unchanged items notify no one
+        and the length is updated once if it changes.
+        """
+        values = list(values)
+        n, m = list_len(self), len(values)
+        with batch():
+            for i in range(min(n, m)):
+                sig = list_get(self, i)
+                prev = sig._value
+                val = wrap_lazy(values[i])
+                if isEqual(prev, val):
+                    continue
+                sig.write(val)
+                if self.LIST_SUBSCRIBERS:
+                    self._emit(REPLACE, i, [sig], [prev])
+            if m > n:
+                self._splice(n, 0, [as_lazy_signal(v) for v in values[n:]])
+            elif m < n:
+                self._splice(m, n - m)
+
     def __getitem__(self, i):
         rv = list.__getitem__(self, i)
         if type(rv) is StoreSignal:
-            return rv.read()
+            return read_value(rv)
         if type(rv) is list:
             self.LIST_LEN.read()
-            return [v.read() for v in rv]
+            return [read_value(v) for v in rv]
 
     def __setitem__(self, i, val):
         items = list_get(self, i)
         if type(i) is int:
-            items.write(wrap(val))
-        else:
-            self._update_len()
-            list_set(self, i, [as_signal(v) for v in val])
+            prev = items._value
+            val = wrap(val)
+            items.write(val)
+            if self.LIST_SUBSCRIBERS and not isEqual(prev, val):
+                self._emit(REPLACE, clamp_index(i, list_len(self)), [items], [prev])
+            return
+
+        start, stop, step = i.indices(list_len(self))
+        signals = [as_lazy_signal(v) for v in val]
+        list_set(self, i, signals)
+        if self.LIST_SUBSCRIBERS:
+            if step != 1:
+                self._emit(RESET)
+            else:
+                if items:
+                    self._emit(REMOVE, start, items)
+                if signals:
+                    self._emit(INSERT, start, signals)
+        self._update_len()
 
     def __delitem__(self, i):
+        items = list_get(self, i)
+        if type(i) is int:
+            index = clamp_index(i, list_len(self))
+        else:
+            index, _, step = i.indices(list_len(self))
         list.__delitem__(self, i)
+        if self.LIST_SUBSCRIBERS:
+            if type(i) is int:
+                self._emit(REMOVE, index, [items])
+            elif step != 1:
+                self._emit(RESET)
+            elif items:
+                self._emit(REMOVE, index, items)
         self._update_len()
 
     def remove(self, val):
-        list.remove(self, val)
+        i = list.index(self, val)
+        item = list_get(self, i)
+        list.__delitem__(self, i)
+        if self.LIST_SUBSCRIBERS:
+            self._emit(REMOVE, i, [item])
         self._update_len()
 
     def extend(self, val):
-        list.extend(self, (as_signal(v) for v in val))
+        n = list_len(self)
+        list.extend(self, (as_lazy_signal(v) for v in val))
+        if self.LIST_SUBSCRIBERS and list_len(self) > n:
+            self._emit(INSERT, n, list_get(self, slice(n, None)))
         self._update_len()
 
     def append(self, val):
-        list.append(self, as_signal(val))
+        item = as_lazy_signal(val)
+        list.append(self, item)
+        if self.LIST_SUBSCRIBERS:
+            self._emit(INSERT, list_len(self) - 1, [item])
         self._update_len()
 
     def insert(self, i, val):
-        list.insert(self, i, as_signal(val))
+        i = clamp_index(i, list_len(self))
+        item = as_lazy_signal(val)
+        list.insert(self, i, item)
+        if self.LIST_SUBSCRIBERS:
+            self._emit(INSERT, i, [item])
         self._update_len()
 
     def __iter__(self):
         self.LIST_LEN.read()
-        return [v.read() for v in list_iter(self)].__iter__()
+        return [read_value(v) for v in list_iter(self)].__iter__()
 
     def clear(self):
         if not list_len(self):
             return
+        items = list(list_iter(self)) if self.LIST_SUBSCRIBERS else ()
         list.clear(self)
+        if items:
+            self._emit(REMOVE, 0, items)
         self._update_len()
 
-    def pop(self, *args):
-        rv = list.pop(self, *args)
+    def pop(self, i=-1):
+        n = list_len(self)
+        rv = list.pop(self, i)
+        if self.LIST_SUBSCRIBERS:
+            self._emit(REMOVE, clamp_index(i, n), [rv])
         self._update_len()
-        return rv.read()
+        return read_value(rv)
 
     def sort(self, *, key=None, reverse=False):
         key_ = key
@@ -263,39 +630,49 @@ class ReactiveList(list):
             def key(x):
                 return x._value
 
-        rv = list.sort(self, key=key, reverse=reverse)
+        if not self.LIST_SUBSCRIBERS:
+            rv = list.sort(self, key=key, reverse=reverse)
+            self._update_len()
+            return rv
+
+        items = list(list_iter(self))
+        order = sorted(range(len(items)), key=lambda j: key(items[j]), reverse=reverse)
+        list_set(self, slice(None), [items[j] for j in order])
+        self._emit(MOVE, order=order)
+        self._update_len()
+
+    def reverse(self):
+        list.reverse(self)
+        if self.LIST_SUBSCRIBERS:
+            self._emit(MOVE, order=list(range(list_len(self) - 1, -1, -1)))
         self._update_len()
-        return rv
 
     def __iadd__(self, other):
         self.extend(other)
         return self
 
     def __add__(self, other):
-        me = [x._value for x in list_iter(self)]
+        me = [materialize(x) for x in list_iter(self)]
         if type(other) is type(self):
-            return me + [x._value for x in list_iter(other)]
+            return me + [materialize(x) for x in list_iter(other)]
         return me + other
 
     def __radd__(self, other):
-        me = [x._value for x in list_iter(self)]
+        me = [materialize(x) for x in list_iter(self)]
         if type(other) is type(self):
-            return [x._value for x in list_iter(other)] + me
+            return [materialize(x) for x in list_iter(other)] + me
         return other + me
 
     def __imul__(self, x):
-        n = len(self)
-        for i in range(1, x):
-            for j in range(n):
-                self.append(as_signal(list_get(self, j)))
-
         if x <= 0:
             self.clear()
-
+        elif x > 1:
+            values = [materialize(sig) for sig in list_iter(self)]
+            self.extend(values * (x - 1))
         return self
 
     def __mul__(self, x):
-        return [r._value for r in list_iter(self) for _ in range(x)]
+        return [materialize(r) for r in list_iter(self) for _ in range(x)]
 
     def __repr__(self):
         self.LIST_LEN.read()
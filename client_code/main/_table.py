@@ -0,0 +1,313 @@
+# SPDX-License-Identifier: MIT
+#
+# Copyright (c) 2023-2025 Anvilistas project team members listed at
+# https://github.com/anvilistas/reactive/graphs/contributors
+#
+# This software is published at https://github.com/anvilistas/reactive
+
+from .._internal.core import Computation, getObserver, untrack
+from .._internal.effect import batch
+from ._computations import UniqueSignal
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    from array import array
+except ImportError:
+    # e.g. in the browser, columns are then plain lists
+    array = None
+
+__version__ = "0.1.3"
+
+BLOCK_SIZE = 1024
+
+
+class TableSignal(UniqueSignal):
+    """a version signal created when first tracked and dropped when unobserved"""
+
+    __slots__ = ["_storeKey"]
+
+    def __init__(self, signals, key):
+        super().__init__(name="-".join(map(str, key)))
+        self._storeKey = (signals, key)
+
+    def _unobserved(self):
+        signals, key = self._storeKey
+        if signals.get(key) is self:
+            del signals[key]
+
+
+def infer_type(values):
+    """'q' for ints, 'd' for numbers and None for anything else"""
+    typecode = "q"
+    for value in values:
+        T = type(value)
+        if T is float:
+            typecode = "d"
+        elif T is not int:
+            return None
+    return typecode
+
+
+class ReactiveTable:
+    """Equal length columns, each stored in a single array
+
+    Numeric columns are held in numpy arrays when numpy is installed, otherwise
+    in stdlib arrays, other columns in lists. Instead of a signal per cell there
+    is a signal per column and per block of rows, created when first tracked.
+    Reading a cell tracks its column's block, reading a row tracks the block of
+    every column and reading a column tracks the whole column.
+    """
+
+    __slots__ = ["_data", "_derived", "_signals", "_len", "_block", "_numpy"]
+
+    def __init__(self, columns=None, types=None, block_size=BLOCK_SIZE, use_numpy=None):
+        self._data = {}
+        self._derived = {}
+        self._signals = {}
+        self._len = 0
+        self._block = block_size
+        self._numpy = numpy is not None if use_numpy is None else use_numpy
+        if self._numpy and numpy is None:
+            raise ImportError("use_numpy requires numpy")
+        types = types or {}
+        for name, values in (columns or {}).items():
+            self.add_column(name, values, types.get(name))
+
+    # storage
+
+    def _store(self, values, typecode):
+        if typecode is None:
+            return list(values)
+        if self._numpy:
+            return numpy.array(values, dtype=typecode)
+        if array is None:
+            return list(values)
+        return array(typecode, values)
+
+    def _cell(self, data, row):
+        value = data[row]
+        return (
+            value.item() if self._numpy and isinstance(data, numpy.ndarray) else value
+        )
+
+    # signals
+
+    def _track(self, *key):
+        if getObserver() is None:
+            return
+        signals = self._signals
+        sig = signals.get(key)
+        if sig is None:
+            sig = signals[key] = TableSignal(signals, key)
+        sig.read()
+
+    def _touch(self, names, start, stop):
+        """notify observers of rows start:stop in the named columns"""
+        signals = self._signals
+        if not signals:
+            return
+        size = self._block
+        blocks = range(start // size, (stop - 1) // size + 1) if stop > start else ()
+        keys = [("block", b) for b in blocks]
+        for name in names:
+            keys.append(("column", name))
+            keys.extend(("cell", name, b) for b in blocks)
+        with batch():
+            for key in keys:
+                sig = signals.get(key)
+                if sig is not None:
+                    sig.update()
+
+    # structure
+
+    def __len__(self):
+        self._track("length")
+        return self._len
+
+    @property
+    def columns(self):
+        return list(self._data) + list(self._derived)
+
+    def add_column(self, name, values, typecode=None):
+        """Add a column, typecode is an array typecode e.g. "d", inferred if omitted"""
+        if name in self._data or name in self._derived:
+            raise KeyError(f"column {name!r} already exists")
+        values = list(values)
+        if self._data and len(values) != self._len:
+            raise ValueError(f"column {name!r} has {len(values)} rows not {self._len}")
+        if typecode is None:
+            typecode = infer_type(values)
+        self._data[name] = self._store(values, typecode)
+        self._len = len(values)
+
+    def derive(self, name, compute, *inputs, typecode=None):
+        """Add a read only column computed from whole columns
+
+        compute(*columns) is called with the input columns and again when any of
+        them changes. It returns the whole column, with numpy in use e.g.
+        derive("total", lambda p, q: p * q, "price", "qty") and otherwise any
+        iterable such as map(operator.mul, p, q).
+        """
+        if name in self._data or name in self._derived:
+            raise KeyError(f"column {name!r} already exists")
+
+        def run(prev):
+            values = compute(*(self.column(c) for c in inputs))
+            if self._numpy and isinstance(values, numpy.ndarray):
+                return values
+            values = list(values)
+            return self._store(values, typecode or infer_type(values))
+
+        node = Computation(None, run, name=f"derived-{name}")
+        self._derived[name] = (node, inputs)
+
+    def append(self, row):
+        """Add a row from a dict with a value for every stored column"""
+        self.extend({name: [value] for name, value in row.items()})
+
+    def extend(self, columns):
+        """Add rows from a dict of equal length sequences, one per stored column"""
+        if set(columns) != set(self._data):
+            raise KeyError("extend needs a value for every stored column")
+        sizes = {len(values) for values in columns.values()}
+        if len(sizes) > 1:
+            raise ValueError("extend needs columns of equal length")
+        count = sizes.pop() if sizes else 0
+        if not count:
+            return
+        # convert every column before changing any, so a bad value changes nothing
+        extra = {}
+        for name, values in columns.items():
+            data = self._data[name]
+            if isinstance(data, list):
+                extra[name] = list(values)
+            elif self._numpy:
+                extra[name] = numpy.asarray(values, dtype=data.dtype)
+            else:
+                extra[name] = array(data.typecode, values)
+
+        start = self._len
+        for name, values in extra.items():
+            data = self._data[name]
+            if self._numpy and not isinstance(data, list):
+                # numpy arrays can't grow in place, extend in large chunks
+                self._data[name] = numpy.concatenate((data, values))
+            else:
+                data.extend(values)
+        self._len = start + count
+        with batch():
+            self._touch(self._data, start, self._len)
+            sig = self._signals.get(("length",))
+            if sig is not None:
+                sig.update()
+
+    # reading
+
+    def _column(self, name):
+        derived = self._derived.get(name)
+        if derived is not None:
+            node, _ = derived
+            if getObserver() is None:
+                return node.read()
+            # observers of rows track the blocks of the inputs instead
+            with untrack():
+                return node.read()
+        try:
+            return self._data[name]
+        except KeyError:
+            raise KeyError(f"no column {name!r}") from None
+
+    def _trackCells(self, name, block):
+        derived = self._derived.get(name)
+        if derived is None:
+            self._track("cell", name, block)
+        else:
+            for input in derived[1]:
+                self._trackCells(input, block)
+
+    def column(self, name):
+        """The whole column, track changes to any of its rows
+
+        This is the stored array, so treat it as read only and use set_column.
+        """
+        derived = self._derived.get(name)
+        if derived is not None:
+            return derived[0].read()
+        self._track("column", name)
+        return self._column(name)
+
+    def _row(self, row):
+        # negative rows count from the end, the block must be the real row's
+        length = self._len
+        if row < 0:
+            row += length
+        if not 0 <= row < length:
+            raise IndexError("table row out of range")
+        return row
+
+    def get(self, row, name):
+        row = self._row(row)
+        self._trackCells(name, row // self._block)
+        return self._cell(self._column(name), row)
+
+    def row(self, row):
+        """The row as a dict"""
+        row = self._row(row)
+        self._track("block", row // self._block)
+        return {name: self._cell(self._column(name), row) for name in self.columns}
+
+    def rows(self, start=0, stop=None):
+        """The rows start:stop as dicts, tracking only the blocks they are in"""
+        start, stop, _ = slice(start, stop).indices(self._len)
+        if stop <= start:
+            return []
+        size = self._block
+        for b in range(start // size, (stop - 1) // size + 1):
+            self._track("block", b)
+        columns = [(name, self._column(name)) for name in self.columns]
+        return [
+            {name: self._cell(data, i) for name, data in columns}
+            for i in range(start, stop)
+        ]
+
+    # writing
+
+    def _stored(self, name):
+        if name in self._derived:
+            raise TypeError(f"column {name!r} is derived and read only")
+        try:
+            return self._data[name]
+        except KeyError:
+            raise KeyError(f"no column {name!r}") from None
+
+    def set(self, row, name, value):
+        data = self._stored(name)
+        row = self._row(row)
+        if self._cell(data, row) == value:
+            return
+        data[row] = value
+        self._touch((name,), row, row + 1)
+
+    def set_column(self, name, values, start=0):
+        """Assign values to the rows of a column from start, in one operation
+
+        Only observers of the blocks written to are notified.
+        """
+        data = self._stored(name)
+        stop = start + len(values)
+        if start < 0 or stop > self._len:
+            raise IndexError("set_column can't change the number of rows")
+        if isinstance(data, list):
+            data[start:stop] = values
+        elif self._numpy:
+            data[start:stop] = values
+        else:
+            data[start:stop] = self._store(values, data.typecode)
+        self._touch((name,), start, stop)
+
+    def __repr__(self):
+        return f"ReactiveTable({self._len} rows, columns={self.columns})"
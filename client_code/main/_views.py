@@ -0,0 +1,245 @@
+# SPDX-License-Identifier: MIT
+#
+# Copyright (c) 2023-2025 Anvilistas project team members listed at
+# https://github.com/anvilistas/reactive/graphs/contributors
+#
+# This software is published at https://github.com/anvilistas/reactive
+
+from bisect import bisect_left
+
+from .._internal.constants import STATE_CLEAN, STATE_DISPOSED
+from .._internal.core import flushBatched
+from .._internal.effect import Effect
+from .._internal.scheduler import RENDER
+from ._aggregate import Reversed, WatchedList, Watcher
+from ._store import ReactiveList
+
+__version__ = "0.1.3"
+
+list_iter = list.__iter__
+
+# changing more items than this at once rebuilds the view in one pass
+REBUILD_SIZE = 32
+list_len = list.__len__
+
+
+class View(WatchedList):
+    """A reactive list derived from a source list, kept up to date item by item
+
+    The view holds the source's own item signals, so a change to an item that
+    keeps its place reaches observers of that item without touching the view.
+    """
+
+    __slots__ = ["_output"]
+
+    def __init__(self, source, key, name):
+        self._output = ReactiveList()
+        super().__init__(source, key, name=name)
+
+    def _createNode(self, name):
+        # applied eagerly so observers of the view see membership changes
+        return Effect(None, self._apply, name=name, lane=RENDER)
+
+    def _rebuild(self, items):
+        output = self._output
+        output._splice(0, list_len(output), items)
+
+    def read(self):
+        # the view may not have caught up if the source changed since the last flush
+        flushBatched()
+        node = self._node
+        state = node._state
+        if state is not STATE_CLEAN and state is not STATE_DISPOSED:
+            node._updateIfNecessary()
+        return self._output
+
+
+class FilteredView(View):
+    """Items matching predicate, in source order
+
+    A flag per source item records whether it is in the view,
+    so an item's place in the view is the number of flags set before it.
+    """
+
+    __slots__ = ["_flags"]
+
+    def __init__(self, source, predicate):
+        self._flags = bytearray()
+        super().__init__(source, predicate, name="filtered_view")
+
+    def _renumber(self, start):
+        watchers = self._watchers
+        for i in range(start, len(watchers)):
+            watchers[i]._index = i
+
+    def _insert(self, index, items):
+        watchers = [Watcher(self, item, self._key) for item in items]
+        self._watchers[index:index] = watchers
+        self._flags[index:index] = bytes(len(watchers))
+        self._renumber(index)
+        self._queue(watchers)
+
+    def _removeRange(self, start, stop):
+        flags = self._flags
+        included = flags.count(1, start, stop)
+        if included:
+            self._output._splice(flags.count(1, 0, start), included)
+        del flags[start:stop]
+        removed = self._watchers[start:stop]
+        del self._watchers[start:stop]
+        for watcher in removed:
+            watcher.dispose()
+        self._renumber(start)
+
+    def _move(self, order):
+        watchers = self._watchers
+        flags = self._flags
+        positions = {}
+        for i, flag in enumerate(flags):
+            if flag:
+                positions[i] = len(positions)
+        self._watchers = [watchers[j] for j in order]
+        self._flags = bytearray(flags[j] for j in order)
+        self._renumber(0)
+        if positions:
+            self._output._reorder([positions[j] for j in order if flags[j]])
+
+    def _apply(self, prev):
+        pending = self._pending
+        self._pending = []
+        flags = self._flags
+        output = self._output
+
+        if len(pending) > REBUILD_SIZE:
+            changed = False
+            for watcher in pending:
+                if watcher._state is STATE_DISPOSED:
+                    continue
+                watcher._updateIfNecessary()
+                watcher._counted = True
+                flag = 1 if watcher._value else 0
+                if flags[watcher._index] != flag:
+                    flags[watcher._index] = flag
+                    changed = True
+            if changed:
+                items = zip(self._watchers, flags)
+                self._rebuild([watcher._item for watcher, flag in items if flag])
+            return None
+
+        for watcher in pending:
+            if watcher._state is STATE_DISPOSED:
+                continue
+            watcher._updateIfNecessary()
+            watcher._counted = True
+            i = watcher._index
+            flag = 1 if watcher._value else 0
+            if flags[i] == flag:
+                continue
+            flags[i] = flag
+            if flag:
+                output._splice(flags.count(1, 0, i), 0, [watcher._item])
+            else:
+                output._splice(flags.count(1, 0, i), 1)
+        return None
+
+
+class SortedView(View):
+    """Items ordered by key, equal keys stay in the order they arrived
+
+    The sort keys are kept in a sorted list beside the view,
+    so an item that changes is moved with a bisect rather than a resort.
+    """
+
+    __slots__ = ["_sortKeys", "_reverse"]
+
+    def __init__(self, source, key, reverse):
+        self._sortKeys = []
+        self._reverse = reverse
+        super().__init__(source, key, name="sorted_view")
+
+    def _sortKey(self, watcher):
+        value = watcher._value
+        return (Reversed(value) if self._reverse else value, watcher._id)
+
+    def _removeRange(self, start, stop):
+        removed = self._watchers[start:stop]
+        del self._watchers[start:stop]
+        counted = [watcher for watcher in removed if watcher._counted]
+
+        if len(counted) > REBUILD_SIZE:
+            ids = {watcher._id for watcher in counted}
+            kept = [
+                (sortKey, item)
+                for sortKey, item in zip(self._sortKeys, list_iter(self._output))
+                if sortKey[1] not in ids
+            ]
+            self._sortKeys = [sortKey for sortKey, _ in kept]
+            self._rebuild([item for _, item in kept])
+        else:
+            sortKeys = self._sortKeys
+            for watcher in counted:
+                i = bisect_left(sortKeys, self._sortKey(watcher))
+                del sortKeys[i]
+                self._output._splice(i, 1)
+
+        for watcher in removed:
+            watcher.dispose()
+
+    def _move(self, order):
+        # the order of the source doesn't change the order of the view
+        watchers = self._watchers
+        self._watchers = [watchers[j] for j in order]
+
+    def _apply(self, prev):
+        pending = self._pending
+        self._pending = []
+        sortKeys = self._sortKeys
+        output = self._output
+
+        if len(pending) > REBUILD_SIZE:
+            for watcher in pending:
+                if watcher._state is not STATE_DISPOSED:
+                    watcher._updateIfNecessary()
+                    watcher._counted = True
+            items = {watcher._id: watcher._item for watcher in self._watchers}
+            self._sortKeys = sorted(map(self._sortKey, self._watchers))
+            self._rebuild([items[sortKey[1]] for sortKey in self._sortKeys])
+            return None
+
+        for watcher in pending:
+            if watcher._state is STATE_DISPOSED:
+                continue
+            old = -1
+            if watcher._counted:
+                old = bisect_left(sortKeys, self._sortKey(watcher))
+                del sortKeys[old]
+            watcher._updateIfNecessary()
+            watcher._counted = True
+            sortKey = self._sortKey(watcher)
+            i = bisect_left(sortKeys, sortKey)
+            sortKeys.insert(i, sortKey)
+            if i == old:
+                # still in the same place
+                continue
+            if old >= 0:
+                output._splice(old, 1)
+            output._splice(i, 0, [watcher._item])
+        return None
+
+
+def filtered_view(source, predicate):
+    """Returns a getter for a reactive list of the items of source matching predicate
+
+    Membership is kept up to date as items are inserted, removed or changed,
+    only the items that changed are tested again.
+    """
+    return FilteredView(source, predicate).read
+
+
+def sorted_view(source, key=None, reverse=False):
+    """Returns a getter for a reactive list of the items of source sorted by key
+
+    Each inserted, removed or changed item is placed with a bisect,
+    the view isn't sorted again. Keys must be comparable with each other.
+    """
+    return SortedView(source, key, reverse).read
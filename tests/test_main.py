@@ -1,17 +1,56 @@
+import json
+
 import anvil
+from client_code._internal import core
+from client_code._internal.core import Computation
 from client_code._internal.effect import flushSync
+from client_code._internal.owner import getOwner, onCleanup, setCurrentOwner
+from client_code._internal.signal import create_memo, create_root
 from client_code.main import (
+    ResourceCache,
+    Scheduler,
+    batch,
     bind,
     computed,
+    count_of,
     create_effect,
+    create_resource,
+    create_selector,
+    deep_equal,
+    disable_leak_tracking,
+    disable_profiling,
     effect,
+    enable_leak_tracking,
+    enable_profiling,
+    filtered_view,
+    find_orphans,
+    get_profile,
+    graph_to_dot,
+    graph_to_json,
+    group_by,
+    index_array,
+    leaked_since,
+    live_counts,
+    map_array,
+    max_of,
+    min_of,
+    profile_table,
     reactive_class,
     reactive_dict,
     reactive_instance,
     reactive_list,
+    reactive_table,
+    reconcile,
+    set_scheduler,
+    shallow_equal,
     signal,
+    snapshot_graph,
+    sorted_view,
+    sum_of,
     writeback,
 )
+from client_code.main._computations import StoreSignal
+from client_code.main._store import EagerReactiveDict
 from client_code.main._utils import is_testing
 
 is_testing.__code__ = (lambda: True).__code__
@@ -289,3 +328,1227 @@ def test_reactive_class_with_slots():
     assert x == 7
     c2.ns.bar = 42
     assert x == 7
+
+
+def test_batch():
+    rc = RC(0)
+    x = reactive_dict(a=1, b=2)
+    runs = 0
+
+    @create_effect
+    def effect_fn():
+        nonlocal runs
+        x["a"], x["b"], rc.foo
+        runs += 1
+
+    assert runs == 1
+
+    with batch():
+        x["a"] = 2
+        x["b"] = 3
+        rc.foo = 4
+        # derived values still see writes made inside the batch
+        assert rc.baz == 4
+        assert runs == 1
+
+    assert runs == 2
+
+    @batch
+    def set_all(a, b):
+        with batch():
+            x["a"] = a
+        x["b"] = b
+        assert runs == 2
+
+    set_all(5, 6)
+    assert runs == 3
+    assert rc.eggs == 4
+
+
+def test_reactive_dict_lazy_signals():
+    x = reactive_dict({i: i for i in range(100)})
+    assert x.DICT_SIGNALS is None
+    assert x.DICT_KEYS is None and x.DICT_BOOL is None
+    assert x[1] == 1
+    assert x.DICT_SIGNALS is None
+
+    seen = []
+
+    @create_effect
+    def effect_fn():
+        seen.append((x.get(1), len(x)))
+
+    assert list(x.DICT_SIGNALS) == [1]
+    assert x.DICT_KEYS is not None
+    assert x.DICT_VALS is None and x.DICT_ITEMS is None
+
+    x[2] = 20
+    assert seen == [(1, 100)]
+    x[1] = 10
+    assert seen == [(1, 100), (10, 100)]
+    x[100] = 100
+    assert seen[-1] == (10, 101)
+    assert x.pop(1) == 10
+    assert seen[-1] == (None, 100)
+    x[1] = 1
+    assert seen[-1] == (1, 101)
+    assert dict(x)[2] == 20
+
+
+def test_reactive_dict_reclaims_signals():
+    cache = reactive_dict()
+    current = Computation(0, None)
+    seen = []
+
+    def build(dispose):
+        # only ever observes the key for the current record
+        create_effect(lambda: seen.append(cache.get(current.read())))
+        return dispose
+
+    dispose = create_root(build)
+    assert list(cache.DICT_SIGNALS) == [0]
+
+    for i in range(1, 50):
+        cache[i] = i
+        current.write(i)
+        cache.pop(i - 1, None)
+
+    assert seen[-1] == 49
+    assert list(cache.DICT_SIGNALS) == [49]
+    assert list(cache) == [49]
+
+    cache[49] = 50
+    assert seen[-1] == 50
+
+    dispose()
+    assert cache.DICT_SIGNALS == {}
+    # the value is stored as is again
+    assert dict.__getitem__(cache, 49) == 50
+    assert cache[49] == 50
+
+
+def test_reclaim_waits_for_the_outermost_update():
+    d = reactive_dict({"k": 1})
+    both = Computation(False, None)
+    seen = []
+
+    # the memo stops reading k just as the effect starts to
+    memo = create_memo(lambda prev: None if both.read() else d.get("k"))
+
+    def build(dispose):
+        create_effect(
+            lambda: seen.append((d.get("k") if both.read() else None, memo()))
+        )
+        return dispose
+
+    dispose = create_root(build)
+    with batch():
+        both.write(True)
+    assert seen == [(None, 1), (1, None)]
+    assert list(d.DICT_SIGNALS) == ["k"]
+
+    d["k"] = 2
+    assert seen[-1] == (2, None)
+    dispose()
+
+
+def test_flush_updates_owners_made_stale_mid_flush():
+    s = Computation(0, None)
+    t = Computation(0, None)
+    runs = {"outer": 0, "inner": 0}
+
+    def first():
+        # writes s once, after the second effect's owners have been walked
+        if t.read() == 1 and s._value == 0:
+            s.write(1)
+
+    def second():
+        t.read()
+        runs["inner"] += 1
+
+    def inner(prev):
+        create_effect(first)
+        create_effect(second)
+
+    def outer(prev):
+        runs["outer"] += 1
+        s.read()
+        Computation(None, inner).read()
+
+    def build(dispose):
+        Computation(None, outer).read()
+        return dispose
+
+    dispose = create_root(build)
+    assert runs == {"outer": 1, "inner": 1}
+    with batch():
+        t.write(1)
+    # outer is brought up to date before the second effect can run under it
+    assert runs == {"outer": 2, "inner": 2}
+    dispose()
+
+
+def test_reactive_list_changes():
+    x = reactive_list([3, 1, 2])
+    changes = []
+
+    unsubscribe = x.subscribe(
+        lambda c: changes.append((c.op, c.index, c.values, c.old, c.order))
+    )
+
+    x.append(4)
+    x.insert(0, 0)
+    x[1] = 5
+    x[1] = 5
+    assert x.pop() == 4
+    x.sort()
+    x.reverse()
+    x[1:3] = [7]
+    del x[0]
+    x.clear()
+    unsubscribe()
+    x.append(1)
+
+    assert changes == [
+        ("insert", 3, [4], None, None),
+        ("insert", 0, [0], None, None),
+        ("replace", 1, [5], [3], None),
+        ("remove", 4, [4], None, None),
+        ("move", 0, [], None, [0, 2, 3, 1]),
+        ("move", 0, [], None, [3, 2, 1, 0]),
+        ("remove", 1, [2, 1], None, None),
+        ("insert", 1, [7], None, None),
+        ("remove", 0, [5], None, None),
+        ("remove", 0, [7, 0], None, None),
+    ]
+
+
+def test_map_array():
+    x = reactive_list([{"id": 1}, {"id": 2}, {"id": 3}])
+    created = []
+    disposed = []
+
+    def row(item, index):
+        created.append(item["id"])
+        onCleanup(lambda: disposed.append(item["id"]))
+        return (item["id"], index)
+
+    mapped = create_root(lambda dispose: (map_array(x, row), dispose))
+    rows, dispose = mapped
+
+    assert [r[0] for r in rows()] == [1, 2, 3]
+    assert created == [1, 2, 3]
+
+    x.append({"id": 4})
+    x.sort(key=lambda item: -item["id"])
+    result = rows()
+    assert [r[0] for r in result] == [4, 3, 2, 1]
+    assert [index() for _, index in result] == [0, 1, 2, 3]
+    assert created == [1, 2, 3, 4]
+
+    x.pop(1)
+    assert [r[0] for r in rows()] == [4, 2, 1]
+    assert disposed == [3]
+
+    dispose()
+    assert sorted(disposed) == [1, 2, 3, 4]
+
+
+def test_map_array_key():
+    # each refetch returns new dicts for the same rows
+    version = Computation(0, None)
+    ids = Computation([1, 2], None)
+    created = []
+    names = []
+
+    def fetch():
+        return [{"id": i, "name": f"{i}-{version.read()}"} for i in ids.read()]
+
+    def row(item, index):
+        created.append(item()["id"])
+        create_effect(lambda: names.append(item()["name"]))
+        return item
+
+    def build(dispose):
+        rows = map_array(fetch, row, key=lambda r: r["id"])
+        create_effect(rows)
+        return rows, dispose
+
+    rows, dispose = create_root(build)
+    assert [item()["id"] for item in rows()] == [1, 2]
+
+    with batch():
+        version.write(1)
+    assert created == [1, 2]
+    assert names == ["1-0", "2-0", "1-1", "2-1"]
+
+    with batch():
+        ids.write([2, 3])
+    assert created == [1, 2, 3]
+    assert [item()["name"] for item in rows()] == ["2-1", "3-1"]
+    dispose()
+
+
+def test_index_array():
+    x = reactive_list([1, 2, 3])
+    calls = []
+
+    def row(item, i):
+        calls.append(i)
+        return item
+
+    rows = index_array(x, row)
+    assert [item() for item in rows()] == [1, 2, 3]
+
+    x[0] = 10
+    x.append(4)
+    assert [item() for item in rows()] == [10, 2, 3, 4]
+    assert calls == [0, 1, 2, 3]
+
+    x.clear()
+    assert rows() == []
+
+
+class ManualScheduler(Scheduler):
+    def __init__(self, **budgets):
+        super().__init__(**budgets)
+        self.clock = 0
+        self.tasks = []
+        self.idle = []
+
+    def now(self):
+        # every check of the clock takes a millisecond
+        self.clock += 1
+        return self.clock
+
+    def queue_task(self, fn):
+        self.tasks.append(fn)
+
+    def queue_idle(self, fn):
+        self.idle.append(fn)
+
+    def run(self, queue):
+        while queue:
+            queue.pop(0)()
+
+
+def test_scheduler_lanes_and_time_slicing():
+    scheduler = ManualScheduler(budget=3)
+    set_scheduler(scheduler)
+    try:
+        x = reactive_dict(value=0)
+        log = []
+
+        for i in range(6):
+            create_effect(lambda i=i: log.append(("user", i, x["value"])))
+        create_effect(lambda: log.append(("idle", x["value"])), lane="idle")
+        create_effect(lambda: log.append(("render", x["value"])), lane="render")
+        log.clear()
+
+        with batch():
+            x["value"] = 1
+
+        # render effects run first, user effects yield once the budget is spent
+        assert log == [("render", 1), ("user", 0, 1), ("user", 1, 1), ("user", 2, 1)]
+        assert len(scheduler.tasks) == 1 and not scheduler.idle
+
+        scheduler.run(scheduler.tasks)
+        assert [entry[1] for entry in log[4:]] == [3, 4, 5]
+        assert scheduler.idle
+
+        scheduler.run(scheduler.idle)
+        assert log[-1] == ("idle", 1)
+    finally:
+        set_scheduler(Scheduler())
+
+
+def test_profiling():
+    update = core.update
+
+    @reactive_class
+    class Cart:
+        def __init__(self):
+            self.price = 2
+            self.qty = 1
+            self.seen = []
+
+        @computed
+        def total(self):
+            return self.price * self.qty
+
+        @effect
+        def log_total(self):
+            self.seen.append(self.total)
+
+    cart = Cart()
+    enable_profiling()
+    try:
+        assert core.update is not update
+        cart.qty = 2
+        cart.qty = 3
+        cart.price = 2
+    finally:
+        disable_profiling()
+
+    assert core.update is update
+    assert cart.seen == [2, 4, 6]
+
+    profile = get_profile()
+    assert profile["computed-total"]["runs"] == 2
+    assert profile["computed-total"]["notified"] == 2
+    assert profile["effect-log_total"]["runs"] == 2
+    assert profile["computed-total"]["total"] >= profile["computed-total"]["own"]
+
+    table = profile_table(sort="runs")
+    assert table.splitlines()[0].split() == [
+        "name",
+        "runs",
+        "total",
+        "own",
+        "max",
+        "notified",
+    ]
+    assert "computed-total" in table
+
+    # nothing is recorded once disabled
+    cart.qty = 4
+    assert get_profile()["computed-total"]["runs"] == 2
+
+
+def test_snapshot_graph():
+    @reactive_class
+    class Counter:
+        def __init__(self):
+            self.count = 1
+
+        @computed
+        def double(self):
+            return self.count * 2
+
+        @effect
+        def show(self):
+            self.double
+
+    counter = Counter()
+    graph = snapshot_graph(counter)
+    by_name = {node["name"]: node for node in graph["nodes"]}
+
+    double = by_name["computed-double"]
+    show = by_name["effect-show"]
+    assert double["kind"] == "memo"
+    assert show["kind"] == "effect"
+    assert (double["fan_in"], double["fan_out"]) == (1, 1)
+    assert [double["id"], show["id"]] in graph["edges"]
+    assert all(node["state"] == "CLEAN" for node in graph["nodes"])
+
+    def build(dispose):
+        source = Computation(0, None, name="source")
+        for _ in range(3):
+            create_effect(lambda: source.read())
+        return dispose, source
+
+    dispose, source = create_root(build)
+    try:
+        graph = snapshot_graph(source)
+        source_node = next(n for n in graph["nodes"] if n["name"] == "source")
+        assert source_node["fan_out"] == 3
+        assert len(graph["edges"]) == 3
+        # effects are owned by the root, which is not reachable from the source
+        assert all(n["owner"] is not None for n in graph["nodes"] if n["fan_in"])
+
+        dot = graph_to_dot(graph)
+        assert dot.startswith("digraph reactive {")
+        assert dot.count(" -> ") == 3
+        assert json.loads(graph_to_json(graph)) == graph
+    finally:
+        dispose()
+
+
+def test_leak_tracking():
+    source = Computation(0, None, name="source")
+
+    def open_form(dispose):
+        for _ in range(3):
+            create_effect(lambda: source.read(), name="form effect")
+        return dispose
+
+    init = Computation.__init__
+    enable_leak_tracking()
+    try:
+        baseline = live_counts()
+        close_form = create_root(open_form)
+        assert leaked_since(baseline) == {"form effect": 3}
+        close_form()
+        assert leaked_since(baseline) == {}
+        assert source._observers == []
+
+        def leaky_form(dispose):
+            # detached from its owner, so disposing the root doesn't reach it
+            prev = setCurrentOwner(None)
+            stray = Computation(None, lambda _: source.read(), name="stray")
+            setCurrentOwner(prev)
+            stray._parent = getOwner()
+            stray.read()
+            return dispose, stray
+
+        close_form, stray = create_root(leaky_form)
+        close_form()
+        assert leaked_since(baseline) == {"stray": 1}
+        assert find_orphans() == [(stray, "owner disposed")]
+
+        # store signals are tracked by identity, not by their value
+        zeros = [StoreSignal(0, name="zero") for _ in range(3)]
+        nested = reactive_list([[1, 2]])
+        assert live_counts()["zero"] == 3
+        zeros[0].write(1)
+        assert live_counts()["zero"] == 3
+        assert nested[0] == [1, 2]
+    finally:
+        disable_leak_tracking()
+
+    assert Computation.__init__ is init
+    assert live_counts() == {}
+
+
+def test_create_selector():
+    selected_id = Computation(None, None)
+    runs = {}
+
+    def build(dispose):
+        is_selected = create_selector(selected_id.read)
+
+        def row(i):
+            def show():
+                runs[i] = runs.get(i, 0) + 1
+                return is_selected(i)
+
+            create_effect(show)
+
+        for i in range(2_000):
+            row(i)
+        return dispose, is_selected
+
+    dispose, is_selected = create_root(build)
+    try:
+        assert all(count == 1 for count in runs.values())
+
+        selected_id.write(5)
+        assert runs[5] == 2
+        assert sum(runs.values()) == 2_001
+        assert is_selected(5) and not is_selected(6)
+
+        selected_id.write(7)
+        assert (runs[5], runs[7]) == (3, 2)
+        assert sum(runs.values()) == 2_003
+
+        # reads inside a batch see the batch's writes
+        with batch():
+            selected_id.write(9)
+            assert is_selected(9) and not is_selected(7)
+        assert (runs[7], runs[9]) == (3, 2)
+    finally:
+        dispose()
+
+
+def test_create_selector_equals():
+    selected = Computation("b", None)
+    seen = {}
+
+    def build(dispose):
+        is_selected = create_selector(selected.read, lambda key, v: key.startswith(v))
+        for key in ["apple", "banana", "blueberry"]:
+            create_effect(lambda key=key: seen.__setitem__(key, is_selected(key)))
+        return dispose
+
+    dispose = create_root(build)
+    assert seen == {"apple": False, "banana": True, "blueberry": True}
+    selected.write("bl")
+    assert seen == {"apple": False, "banana": False, "blueberry": True}
+    dispose()
+
+
+def test_create_resource():
+    jobs = []
+    calls = []
+
+    def fetch(record_id):
+        calls.append(record_id)
+        if record_id == "bad":
+            raise ValueError(record_id)
+        return f"record {record_id}"
+
+    record_id = Computation(1, None)
+    seen = []
+
+    def build(dispose):
+        record = create_resource(record_id.read, fetch, run=jobs.append)
+        title = create_memo(lambda _: record().upper() if record() else None)
+        create_effect(
+            lambda: seen.append((None if record.error() else title(), record.loading()))
+        )
+        return dispose, record, title
+
+    dispose, record, title = create_root(build)
+    try:
+        assert record.loading() and record() is None
+        assert seen == [(None, True)]
+        jobs.pop(0)()
+        assert seen[-1] == ("RECORD 1", False)
+
+        # only the response for the latest key is kept
+        record_id.write(2)
+        record_id.write(3)
+        assert record.loading() and record() == "record 1"
+        # the loading flag reaches memos that read the resource
+        assert title.__self__.loading() and title() == "RECORD 1"
+        # switching back to a key in flight shares its request
+        record_id.write(2)
+        assert len(jobs) == 2
+        for job in jobs:
+            job()
+        del jobs[:]
+        assert calls == [1, 2, 3]
+        assert record() == "record 2" and not record.loading()
+        assert seen[-1] == ("RECORD 2", False)
+
+        record_id.write("bad")
+        jobs.pop(0)()
+        assert record.error()
+        try:
+            record()
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("expected the fetch error")
+
+        record_id.write(None)
+        assert not jobs and not record.loading()
+    finally:
+        dispose()
+
+
+class Clock(Scheduler):
+    def __init__(self):
+        super().__init__()
+        self.clock = 0
+
+    def now(self):
+        return self.clock
+
+
+def test_resource_cache():
+    clock = Clock()
+    set_scheduler(clock)
+    jobs = []
+    calls = []
+
+    def fetch(key):
+        calls.append(key)
+        return f"{key} v{len(calls)}"
+
+    def run(queue):
+        while queue:
+            queue.pop(0)()
+
+    cache = ResourceCache(ttl=1000, max_size=2)
+    key = Computation(1, None)
+    version = Computation(0, None)
+
+    def resource():
+        return create_resource(key.read, fetch, cache=cache, run=jobs.append)
+
+    try:
+        dispose, (a, b) = create_root(lambda d: (d, (resource(), resource())))
+        # identical requests share one call
+        assert len(jobs) == 1 and a.loading() and b.loading()
+        run(jobs)
+        assert a() == b() == "1 v1"
+
+        # fresh values are served without fetching
+        clock.clock = 500
+        dispose_c, c = create_root(lambda d: (d, resource()))
+        assert c() == "1 v1" and not c.loading() and not jobs
+
+        # stale values are served while they are fetched again
+        clock.clock = 1500
+        dispose_d, d = create_root(lambda d: (d, resource()))
+        assert d() == "1 v1" and not d.loading() and len(jobs) == 1
+        run(jobs)
+        assert a() == b() == c() == d() == "1 v2"
+        dispose_c()
+        dispose_d()
+
+        # a change to a tracked signal invalidates the cache
+        stop = create_root(lambda d: cache.invalidate_on(version.read))
+        version.write(1)
+        assert len(jobs) == 1
+        run(jobs)
+        assert a() == "1 v3"
+        stop()
+
+        # least recently used entries nothing shows are evicted
+        key.write(2)
+        run(jobs)
+        key.write(3)
+        run(jobs)
+        assert a() == b() == "3 v5"
+        assert len(cache) == 2
+        assert (fetch, 1) not in cache and (fetch, 3) in cache
+
+        a.refetch()
+        assert a.loading() and len(jobs) == 1
+        run(jobs)
+        assert a() == b() == "3 v6" and not a.loading()
+        assert calls == [1, 1, 1, 2, 3, 3]
+        dispose()
+    finally:
+        set_scheduler(Scheduler())
+
+
+def test_equality_strategies():
+    assert shallow_equal((1, "a", None), (1, "a", None))
+    assert not shallow_equal(([1],), ([1],))
+    assert shallow_equal({"a": 1}, {"a": 1}) and not shallow_equal({"a": 1}, {"b": 1})
+    assert deep_equal({"a": [1, (2, {3})]}, {"a": [1, (2, {3})]})
+    assert not deep_equal({"a": [1, 2]}, {"a": [1, 3]})
+    assert not deep_equal([1], (1,))
+    assert not deep_equal(list(range(10)), list(range(10)), max_size=5)
+
+    source = Computation(0, None)
+    runs = {}
+
+    def memo(equals):
+        # recomputes to an equal but new tuple on every write
+        node = create_memo(lambda _: (source.read() // 10, "x"), equals=equals)
+
+        def watch():
+            runs[equals] = runs.get(equals, 0) + 1
+            node()
+
+        create_effect(watch)
+
+    def build(dispose):
+        for equals in [None, "identity", "equal", "shallow", "deep"]:
+            memo(equals)
+        return dispose
+
+    dispose = create_root(build)
+    for i in range(1, 5):
+        source.write(i)
+    assert runs == {None: 5, "identity": 5, "equal": 1, "shallow": 1, "deep": 1}
+    dispose()
+
+    try:
+        create_memo(lambda _: 1, equals="nope")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected an unknown strategy to raise")
+
+
+def test_assigned_payloads_are_copied_when_read():
+    @reactive_class
+    class Model:
+        data = signal()
+
+    payload = {"rows": [{"id": 1}], "count": 1}
+    model = Model()
+    model.data = payload
+
+    # the top level is copied on assignment
+    payload["count"] = 2
+    assert model.data["count"] == 1
+    # nested containers are shared until first read, then copied
+    payload["rows"].append({"id": 2})
+    rows = model.data["rows"]
+    assert [row["id"] for row in rows] == [1, 2]
+    payload["rows"].append({"id": 3})
+    assert [row["id"] for row in rows] == [1, 2]
+
+
+def test_equality_on_reactive_classes():
+    @reactive_class
+    class Shape:
+        points = signal(default_factory=list, equals="deep")
+
+        def __init__(self):
+            self.renders = 0
+
+        @computed(equals="equal")
+        def bounds(self):
+            xs = [x for x, _ in self.points] or [0]
+            return (min(xs), max(xs))
+
+        @effect
+        def render(self):
+            self.bounds
+            self.renders += 1
+
+    shape = Shape()
+    shape.points = [(0, 0), (4, 1)]
+    assert shape.renders == 2
+    # an equal value doesn't notify
+    shape.points = [(0, 0), (4, 1)]
+    # a new value with the same bounds doesn't re-render
+    shape.points = [(0, 0), (2, 2), (4, 1)]
+    assert shape.renders == 2
+    shape.points = [(0, 0), (5, 1)]
+    assert shape.renders == 3
+
+    # the instance dict compares the same way, so its views aren't bumped either
+    store = vars(shape)
+    views = []
+    dispose = create_root(
+        lambda dispose: (create_effect(lambda: views.append(store.items())), dispose)
+    )[1]
+    store["points"] = [(0, 0), (5, 1)]
+    assert len(views) == 1
+    store["points"] = [(0, 0)]
+    assert len(views) > 1 and dict(views[-1])["points"] == [(0, 0)]
+    dispose()
+
+    # reactive instances can be sent between server and client
+    name, cls = type(store).SERIALIZATION_INFO
+    assert cls is EagerReactiveDict and name.endswith("EagerReactiveDict")
+    assert type(cls.__new_deserialized__({"a": 1}, None)) is dict
+
+
+def test_equality_after_keys_are_observed():
+    @reactive_class
+    class Filters:
+        options = signal(default_factory=dict, equals="deep")
+        tags = signal(default_factory=list, equals="shallow")
+
+        def __init__(self):
+            self.runs = 0
+
+        @effect
+        def apply(self):
+            # observing a key stores its value in a signal
+            self.options.get("size")
+            list(self.tags)
+            self.runs += 1
+
+    filters = Filters()
+    filters.options = {"size": 2, "nested": {"a": [1]}}
+    filters.tags = ["a", "b"]
+    assert filters.runs == 3
+    filters.options = {"size": 2, "nested": {"a": [1]}}
+    filters.tags = ["a", "b"]
+    assert filters.runs == 3
+    filters.options = {"size": 3, "nested": {"a": [1]}}
+    assert filters.runs == 4
+
+    assert deep_equal(reactive_dict({"a": [1]}), {"a": [1]})
+    assert shallow_equal(reactive_list([1, "x"]), reactive_list([1, "x"]))
+    assert not shallow_equal(reactive_list([1, "x"]), [1, "y"])
+
+
+def test_aggregates():
+    rows = reactive_list(
+        [
+            {"team": "a", "score": 3},
+            {"team": "b", "score": 5},
+            {"team": "a", "score": 1},
+        ]
+    )
+
+    def build(dispose):
+        aggregates = {
+            "sum": sum_of(rows, lambda row: row["score"]),
+            "count": count_of(rows, lambda row: row["score"] > 2),
+            "min": min_of(rows, lambda row: row["score"]),
+            "max": max_of(rows, lambda row: row["score"]),
+            "groups": group_by(rows, lambda row: row["team"], lambda row: row["score"]),
+            "sizes": group_by(rows, lambda row: row["team"]),
+        }
+        return dispose, aggregates
+
+    dispose, aggregates = create_root(build)
+    seen = []
+    create_effect(lambda: seen.append(aggregates["sum"]()))
+
+    def values():
+        return {name: getter() for name, getter in aggregates.items()}
+
+    assert values() == {
+        "sum": 9,
+        "count": 2,
+        "min": 1,
+        "max": 5,
+        "groups": {"a": 4, "b": 5},
+        "sizes": {"a": 2, "b": 1},
+    }
+
+    rows[1]["score"] = 10
+    assert seen == [9, 14]
+    rows.append({"team": "c", "score": 0})
+    rows.pop(0)
+    rows[0]["team"] = "a"
+    assert values() == {
+        "sum": 11,
+        "count": 1,
+        "min": 0,
+        "max": 10,
+        "groups": {"a": 11, "c": 0},
+        "sizes": {"a": 2, "c": 1},
+    }
+
+    rows.sort(key=lambda row: row["score"])
+    rows[1:] = [{"team": "b", "score": 7}]
+    rows.reverse()
+    assert values()["sum"] == 7 and values()["max"] == 7
+    assert values()["groups"] == {"b": 7, "c": 0}
+
+    rows.clear()
+    assert values() == {
+        "sum": 0,
+        "count": 0,
+        "min": None,
+        "max": None,
+        "groups": {},
+        "sizes": {},
+    }
+    dispose()
+
+
+def test_float_sums_do_not_drift():
+    from math import fsum
+
+    rows = reactive_list({"team": i % 2, "amount": i + 0.1} for i in range(1000))
+
+    def build(dispose):
+        total = sum_of(rows, lambda row: row["amount"])
+        groups = group_by(rows, lambda row: row["team"], lambda row: row["amount"])
+        create_effect(lambda: (total(), groups()))
+        return dispose, total, groups
+
+    dispose, total, groups = create_root(build)
+    for i in range(1000):
+        rows[i * 7 % 1000]["amount"] += (0.1, 0.7, 12.3)[i % 3]
+
+    # fsum is the exactly rounded sum, as sum() of floats is from Python 3.12
+    amounts = [row["amount"] for row in rows]
+    assert total() == fsum(amounts)
+    assert groups() == {0: fsum(amounts[::2]), 1: fsum(amounts[1::2])}
+    dispose()
+
+
+def test_filtered_and_sorted_views():
+    rows = reactive_list(
+        [
+            {"name": "ann", "score": 3},
+            {"name": "bob", "score": 5},
+            {"name": "cat", "score": 1},
+        ]
+    )
+
+    def build(dispose):
+        high = filtered_view(rows, lambda row: row["score"] > 2)
+        ranked = sorted_view(rows, lambda row: row["score"], reverse=True)
+        return dispose, high, ranked
+
+    dispose, high, ranked = create_root(build)
+
+    def names(view):
+        return [row["name"] for row in view()]
+
+    lengths = []
+    create_effect(lambda: lengths.append(len(high())))
+
+    assert names(high) == ["ann", "bob"]
+    assert names(ranked) == ["bob", "ann", "cat"]
+
+    rows[2]["score"] = 4
+    assert names(high) == ["ann", "bob", "cat"]
+    assert names(ranked) == ["bob", "cat", "ann"]
+    assert lengths == [2, 3]
+
+    # the view shares the rows' signals, so edits that keep the order show through
+    rows[1]["name"] = "ben"
+    assert names(high) == ["ann", "ben", "cat"]
+    assert names(ranked) == ["ben", "cat", "ann"]
+
+    rows.insert(0, {"name": "dan", "score": 9})
+    rows.pop(2)
+    assert names(high) == ["dan", "ann", "cat"]
+    assert names(ranked) == ["dan", "cat", "ann"]
+
+    rows.reverse()
+    assert names(high) == ["cat", "ann", "dan"]
+    assert names(ranked) == ["dan", "cat", "ann"]
+
+    rows[0]["score"] = 0
+    rows.extend({"name": str(i), "score": i % 10} for i in range(100))
+    assert len(high()) == 2 + 70
+    assert [row["score"] for row in ranked()][:12] == [9] * 11 + [8]
+    assert names(ranked)[0] == "dan"
+
+    del rows[3:]
+    assert names(high) == ["ann", "dan"]
+    assert names(ranked) == ["dan", "ann", "cat"]
+
+    rows[:] = [{"name": "eve", "score": 2}]
+    assert names(high) == []
+    assert names(ranked) == ["eve"]
+
+    rows.append({"name": "fay", "score": 1})
+    with batch():
+        rows[1]["score"] = 3
+        assert names(high) == ["fay"]
+        assert names(ranked) == ["fay", "eve"]
+    dispose()
+
+
+def test_reactive_table():
+    from operator import mul
+
+    table = reactive_table(
+        {"name": ["a", "b", "c"], "price": [1.5, 2.0, 4.0], "qty": [2, 1, 0]},
+        block_size=2,
+        use_numpy=False,
+    )
+    table.derive("total", lambda price, qty: map(mul, price, qty), "price", "qty")
+    assert table.columns == ["name", "price", "qty", "total"]
+    assert type(table.column("price")).__name__ == "array"
+    assert table.row(0) == {"name": "a", "price": 1.5, "qty": 2, "total": 3.0}
+
+    seen = {"cell": [], "first": [], "qty": [], "total": [], "len": []}
+
+    def build(dispose):
+        create_effect(lambda: seen["cell"].append(table.get(2, "qty")))
+        create_effect(lambda: seen["first"].append(table.rows(0, 2)[0]["qty"]))
+        create_effect(lambda: seen["qty"].append(sum(table.column("qty"))))
+        create_effect(lambda: seen["total"].append(sum(table.column("total"))))
+        create_effect(lambda: seen["len"].append(len(table)))
+        return dispose
+
+    dispose = create_root(build)
+
+    # a write only reaches observers of its column and block
+    table.set(0, "qty", 3)
+    assert seen["cell"] == [0]
+    assert seen["first"] == [2, 3]
+    assert seen["qty"] == [3, 4]
+    assert seen["total"] == [5.0, 6.5]
+    table.set(0, "qty", 3)
+    assert seen["qty"] == [3, 4]
+
+    table.set_column("qty", [6], start=2)
+    assert seen["cell"] == [0, 6]
+    assert seen["first"] == [2, 3]
+    assert seen["total"][-1] == 4.5 + 2 + 24
+    table.set_column("qty", [1, 1, 1])
+    assert seen["first"] == [2, 3, 1]
+    assert seen["total"][-1] == 7.5
+
+    table.extend({"name": ["d"], "price": [1.0], "qty": [1]})
+    assert seen["len"] == [3, 4]
+    assert table.get(3, "total") == 1.0
+    table.append({"name": "e", "price": 2.0, "qty": 2})
+    assert table.rows(3) == [
+        {"name": "d", "price": 1.0, "qty": 1, "total": 1.0},
+        {"name": "e", "price": 2.0, "qty": 2, "total": 4.0},
+    ]
+
+    try:
+        table.set(0, "total", 1)
+    except TypeError:
+        pass
+    else:
+        assert False, "derived columns are read only"
+    try:
+        table.set_column("qty", [1, 2], start=4)
+    except IndexError:
+        pass
+    else:
+        assert False, "set_column can't add rows"
+    try:
+        table.extend({"name": ["f"], "price": [1.0], "qty": ["x"]})
+    except TypeError:
+        pass
+    else:
+        assert False, "qty holds ints"
+    # nothing was added to the columns before qty
+    assert len(table) == 5
+    assert list(table.column("name")) == ["a", "b", "c", "d", "e"]
+    assert len(table.column("price")) == 5
+
+    # negative rows count from the end and notify the last row's observers
+    last = []
+
+    def watch_last(dispose):
+        create_effect(lambda: last.append(table.get(4, "qty")))
+        return dispose
+
+    stop = create_root(watch_last)
+    table.set(-1, "qty", 7)
+    assert last == [2, 7]
+    assert table.get(-1, "qty") == 7 and table.row(-1)["name"] == "e"
+    assert [row["name"] for row in table.rows(-2)] == ["d", "e"]
+    stop()
+    try:
+        table.get(5, "qty")
+    except IndexError:
+        pass
+    else:
+        assert False, "row 5 is past the end"
+
+    dispose()
+    # only the derived column still observes the table
+    assert sorted(table._signals) == [("column", "price"), ("column", "qty")]
+
+
+def test_bulk_updates_notify_once():
+    d = reactive_dict({"a": 1, "b": 2})
+    items = reactive_list([1, 2, 3])
+    runs = {"keys": 0, "a": 0, "b": 0, "len": 0}
+    changes = []
+
+    def count(name, fn):
+        def run():
+            fn()
+            runs[name] += 1
+
+        create_effect(run)
+
+    def build(dispose):
+        count("keys", lambda: list(d.keys()))
+        count("a", lambda: d.get("a"))
+        count("b", lambda: d.get("b"))
+        count("len", lambda: len(items))
+        items.subscribe(changes.append)
+        return dispose
+
+    dispose = create_root(build)
+    runs.update(dict.fromkeys(runs, 0))
+
+    d.update({f"k{i}": i for i in range(5_000)}, a=10)
+    assert d.DICT_KEYS._value == 1
+    assert runs == {"keys": 1, "a": 1, "b": 0, "len": 0}
+
+    d.replace_all(a=10, c=3)
+    assert dict(d) == {"a": 10, "c": 3}
+    assert runs == {"keys": 2, "a": 1, "b": 1, "len": 0}
+    d.update(a=10)
+    d.replace_all(a=10, c=3)
+    assert runs["keys"] == 2
+
+    assert items.splice(1, 1, ["x", "y"]) == [2]
+    assert list(items) == [1, "x", "y", 3]
+    assert [c.op for c in changes] == ["remove", "insert"]
+    assert runs["len"] == 1
+
+    del changes[:]
+    items.assign_from([1, "z", "y"])
+    assert list(items) == [1, "z", "y"]
+    assert [(c.op, c.index) for c in changes] == [("replace", 1), ("remove", 3)]
+    assert runs["len"] == 2
+    items.assign_from([1, "z", "y"])
+    assert runs["len"] == 2
+
+    items *= 3
+    assert len(items) == 9 and runs["len"] == 3
+    d.clear()
+    assert runs["keys"] == 3 and not d
+    dispose()
+
+
+def test_reconcile():
+    data = reactive_dict(
+        {
+            "title": "orders",
+            "meta": {"page": 1, "tags": ["a"]},
+            "rows": [
+                {"id": 1, "qty": 1},
+                {"id": 2, "qty": 2},
+                {"id": 3, "qty": 3},
+            ],
+        }
+    )
+    rows = data["rows"]
+    first = rows[0]
+    seen = {"title": 0, "page": 0, "len": 0, "qty1": 0, "qty2": 0}
+    changes = []
+
+    def count(name, fn):
+        def run():
+            fn()
+            seen[name] += 1
+
+        create_effect(run)
+
+    def build(dispose):
+        count("title", lambda: data.get("title"))
+        count("page", lambda: data["meta"]["page"])
+        count("len", lambda: len(data["rows"]))
+        count("qty1", lambda: rows[0]["qty"])
+        count("qty2", lambda: rows[1]["qty"])
+        rows.subscribe(changes.append)
+        return dispose
+
+    dispose = create_root(build)
+    seen.update(dict.fromkeys(seen, 0))
+
+    fresh = {
+        "title": "orders",
+        "meta": {"page": 2, "tags": ["a"]},
+        "rows": [
+            {"id": 1, "qty": 1},
+            {"id": 2, "qty": 5},
+            {"id": 3, "qty": 3},
+        ],
+    }
+    assert reconcile(data, fresh, key="id") is data
+    assert seen == {"title": 0, "page": 1, "len": 0, "qty1": 0, "qty2": 1}
+    assert data["rows"] is rows and rows[0] is first
+    assert changes == []
+
+    # a refresh with nothing new changes nothing
+    reconcile(data, fresh, key="id")
+    assert seen == {"title": 0, "page": 1, "len": 0, "qty1": 0, "qty2": 1}
+
+    fresh["rows"] = [{"id": 4, "qty": 4}, {"id": 3, "qty": 3}, {"id": 1, "qty": 1}]
+    del fresh["title"]
+    reconcile(data, fresh, key="id")
+    assert "title" not in data
+    assert [row["id"] for row in rows] == [4, 3, 1]
+    assert rows[2] is first
+    assert [c.op for c in changes] == ["remove", "move", "insert"]
+    assert seen["len"] == 1
+
+    # key is only for the rows, their nested lists match by position
+    fresh["rows"] = [{"id": 4, "qty": 4, "tags": ["new", "big"]}]
+    reconcile(data, fresh, key="id")
+    tags = rows[0]["tags"]
+    tag_changes = []
+    tags.subscribe(tag_changes.append)
+    tag_runs = []
+
+    def watch_tags(dispose):
+        create_effect(lambda: tag_runs.append(list(tags)))
+        return dispose
+
+    dispose_tags = create_root(watch_tags)
+    reconcile(data, fresh, key="id")
+    assert tag_changes == [] and len(tag_runs) == 1
+    fresh["rows"][0]["tags"] = ["new", "small"]
+    reconcile(data, fresh, key="id")
+    assert [c.op for c in tag_changes] == ["replace"]
+    assert tag_runs[-1] == ["new", "small"]
+    dispose_tags()
+
+    # by position
+    items = reactive_list([1, {"x": 1}, 3])
+    nested = items[1]
+    reconcile(items, [1, {"x": 2}, 3, 4])
+    assert items[1] is nested and nested["x"] == 2
+    assert list(items)[2:] == [3, 4]
+
+    try:
+        reconcile(items, {"x": 1})
+    except TypeError:
+        pass
+    else:
+        assert False, "a list can't be reconciled with a dict"
+    dispose()
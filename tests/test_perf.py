@@ -0,0 +1,448 @@
+import sys
+import tracemalloc
+
+import benchmarks.cases  # noqa: F401 - registers the cases
+from benchmarks import CASES, compare, run_all
+from client_code._internal.core import Computation
+from client_code._internal.effect import batch
+from client_code._internal.owner import Owner
+from client_code._internal.signal import create_effect, create_root
+from client_code.main import filtered_view, reactive_class, reconcile, signal, sum_of
+from client_code.main._computations import StoreSignal
+from client_code.main._store import EagerReactiveDict, ReactiveDict, ReactiveList
+from client_code.main._table import ReactiveTable
+from client_code.main._utils import is_testing
+
+is_testing.__code__ = (lambda: True).__code__
+
+
+def test_unlinking_is_independent_of_fan_out(fan_out=1_000):
+    shared = Computation(0, None)
+    toggle = Computation(0, None)
+
+    def compute(prev):
+        if toggle.read() % 2 == 0:
+            shared.read()
+
+    node = Computation(None, compute)
+    node.read()
+    others = [Computation(None, lambda prev: shared.read()) for _ in range(fan_out)]
+    for memo in others:
+        memo.read()
+
+    before = list(shared._observers)
+    assert before[0] is node
+
+    toggle.write(1)
+    node.read()
+
+    # the last observer is swapped into the vacated slot and nothing else moves
+    expected = before[:-1]
+    expected[0] = before[-1]
+    assert [id(o) for o in shared._observers] == [id(o) for o in expected]
+    # and every edge still records its slot at the other end
+    for slot, (observer, i) in enumerate(zip(shared._observers, shared._observerSlots)):
+        assert observer._sources[i] is shared
+        assert observer._sourceSlots[i] == slot
+
+
+def test_stable_dependencies_reuse_edges():
+    signals = [Computation(i, None) for i in range(100)]
+    node = Computation(None, lambda prev: sum(s.read() for s in signals))
+    assert node.read() == sum(range(100))
+
+    sources = node._sources
+    sourceSlots = node._sourceSlots
+    observers = [s._observers for s in signals]
+
+    for i in range(1000):
+        signals[i % 100].write(signals[i % 100]._value + 1)
+        node.read()
+
+    # re-running with the same dependencies keeps the same edge lists
+    assert node._sources is sources
+    assert node._sourceSlots is sourceSlots
+    assert len(sources) == 100
+    for s, obs in zip(signals, observers):
+        assert s._observers is obs
+        assert s._observers == [node]
+
+
+def test_changed_dependencies_rewire_suffix():
+    a, b, c, d = (Computation(i, None) for i in range(4))
+    toggle = Computation(True, None)
+
+    def compute(prev):
+        a.read()
+        toggle.read()
+        if toggle.read():
+            return b.read() + c.read()
+        return d.read()
+
+    node = Computation(None, compute)
+    assert node.read() == 3
+    sources = node._sources
+    assert sources == [a, toggle, b, c]
+
+    toggle.write(False)
+    assert node.read() == 3
+    assert node._sources is sources
+    assert sources == [a, toggle, d]
+    assert b._observers == [] and c._observers == []
+    assert d._observers == [node]
+
+    toggle.write(True)
+    b.write(10)
+    assert node.read() == 12
+    assert sources == [a, toggle, b, c]
+    assert d._observers == []
+    assert a._observers == [node]
+
+
+class DictLayout:
+    """the attribute layout of a signal before nodes were slotted"""
+
+    def __init__(self, attrs):
+        self.__dict__.update(attrs)
+
+
+def bytes_per_object(factory, n=10_000):
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        objects = [factory(i) for i in range(n)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    assert len(objects) == n
+    return (after - before) / n
+
+
+def test_signal_memory_layout():
+    sig = StoreSignal(0)
+    assert not hasattr(sig, "__dict__")
+
+    attrs = {
+        slot: getattr(sig, slot)
+        for cls in type(sig).__mro__[:-1]
+        for slot in cls.__slots__
+    }
+    slotted = bytes_per_object(StoreSignal)
+    unslotted = bytes_per_object(lambda i: DictLayout(dict(attrs, _value=i)))
+    assert slotted < unslotted
+
+
+def payload(rows=5_000):
+    return {
+        "rows": [
+            {"id": i, "name": f"row {i}", "meta": {"tags": ["a", "b"], "score": i}}
+            for i in range(rows)
+        ]
+    }
+
+
+def touch(value):
+    # read every nested value so each container is wrapped
+    if isinstance(value, ReactiveDict):
+        for v in value.values():
+            touch(v)
+    elif isinstance(value, ReactiveList):
+        for v in value:
+            touch(v)
+
+
+def peak_memory(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_nested_payload_is_wrapped_on_demand():
+    @reactive_class
+    class Model:
+        data = signal()
+
+    lazy, eager = Model(), Model()
+    lazy_data, eager_data = payload(), payload()
+
+    def assign_lazy():
+        lazy.data = lazy_data
+
+    def assign_eager():
+        eager.data = eager_data
+        touch(eager.data)
+
+    lazy_peak = peak_memory(assign_lazy)
+    eager_peak = peak_memory(assign_eager)
+    assert lazy_peak * 10 < eager_peak
+
+    rows = lazy.data["rows"]
+    assert type(rows) is ReactiveList
+    row = rows[5]
+    assert type(row) is ReactiveDict
+    assert row["meta"]["tags"][1] == "b"
+    assert rows[5] is row
+    assert type(dict.__getitem__(row, "meta")) is ReactiveDict
+    assert type(dict.__getitem__(rows[6], "meta")) is dict
+
+
+class CountingParent:
+    """stands in for Owner._parent, counting the steps taken up the owner tree"""
+
+    def __init__(self, slot):
+        self.slot = slot
+        self.reads = 0
+
+    def __get__(self, owner, cls=None):
+        if owner is None:
+            return self
+        self.reads += 1
+        return self.slot.__get__(owner, cls)
+
+    def __set__(self, owner, value):
+        self.slot.__set__(owner, value)
+
+
+def test_flush_runs_each_dirty_effect_once(depth=50, width=100):
+    source = Computation(0, None)
+    runs = {"leaf": 0, "level": 0}
+
+    # every level owns `width` effects reading source and one nested level
+    def level(d):
+        runs["level"] += 1
+        for _ in range(width):
+            create_effect(lambda: (source.read(), runs.update(leaf=runs["leaf"] + 1)))
+        if d < depth:
+            create_effect(lambda: level(d + 1))
+
+    dispose = create_root(lambda dispose: (level(1), dispose)[1])
+    slot = Owner.__dict__["_parent"]
+    parent = Owner._parent = CountingParent(slot)
+    try:
+        assert runs == {"leaf": depth * width, "level": depth}
+        for i in range(1, 3):
+            parent.reads = 0
+            with batch():
+                source.write(i)
+            assert runs == {"leaf": (i + 1) * depth * width, "level": depth}
+            # each owner is walked past once per flush, not once per effect under it
+            assert parent.reads <= 3 * depth * width
+    finally:
+        Owner._parent = slot
+        dispose()
+
+
+def test_long_chain_propagates_without_recursion():
+    length = sys.getrecursionlimit() * 10
+    head = Computation(0, None)
+    chain = [head]
+    for _ in range(length):
+        prev = chain[-1]
+        node = Computation(None, lambda _, prev=prev: prev.read() + 1)
+        # read as we go so each initial compute stays shallow
+        node.read()
+        chain.append(node)
+
+    tail = chain[-1]
+    seen = []
+
+    def dispose_root(dispose):
+        create_effect(lambda: seen.append(tail.read()))
+        return dispose
+
+    dispose = create_root(dispose_root)
+    try:
+        assert seen == [length]
+        head.write(1)
+        assert seen == [length, length + 1]
+        assert tail.read() == length + 1
+    finally:
+        dispose()
+
+
+def test_benchmark_suite_runs():
+    # the key churn case takes seconds, test_dict_key_churn_is_bounded covers it
+    results = run_all([name for name in CASES if name != "dict_key_churn"], repeat=1)
+    assert set(results["results"]) >= {"signal_write_fan_out", "diamond"}
+    rows = list(compare(results, results))
+    assert all(ratio == 1 and not verdict for *_, ratio, verdict in rows)
+
+
+def test_dict_key_churn_is_bounded():
+    cache = ReactiveDict()
+    current = Computation(0, None)
+
+    def build(dispose):
+        create_effect(lambda: cache.get(current.read()))
+        return dispose
+
+    dispose = create_root(build)
+
+    def churn(start, stop):
+        for i in range(start, stop):
+            cache[i] = {"id": i}
+            current.write(i)
+            cache.pop(i - 1, None)
+
+    try:
+        first = peak_memory(lambda: churn(1, 2_000))
+        peak = peak_memory(lambda: churn(2_000, 20_000))
+        assert len(cache.DICT_SIGNALS) == 1
+        assert len(cache) == 1
+        assert peak < first * 2
+    finally:
+        dispose()
+
+
+def key_calls(make_result, rows=10_000, updates=20):
+    """how many times the key function runs per single row update"""
+    records = ReactiveList({"amount": i} for i in range(rows))
+    calls = [0]
+    seen = []
+
+    def amount(record):
+        calls[0] += 1
+        return record["amount"]
+
+    def build(dispose):
+        result = make_result(records, amount)
+        create_effect(lambda: seen.append(result()))
+        return dispose
+
+    dispose = create_root(build)
+    try:
+        calls[0] = 0
+        for i in range(updates):
+            records[i]["amount"] += 1
+        assert len(seen) == updates + 1
+        return calls[0] / updates
+    finally:
+        dispose()
+
+
+def recompute(reduce):
+    def make_result(records, key):
+        return Computation(None, lambda _: reduce(map(key, records))).read
+
+    return make_result
+
+
+def test_incremental_sum_is_independent_of_size():
+    assert key_calls(recompute(sum)) == 10_000
+    assert key_calls(lambda records, key: sum_of(records, key)) == 1
+
+
+def test_filtered_view_refilters_only_changed_rows():
+    def odd(key):
+        return lambda record: key(record) % 2
+
+    def refilter(records, key):
+        return Computation(None, lambda _: list(filter(odd(key), records))).read
+
+    assert key_calls(refilter) == 10_000
+
+    def incremental(records, key):
+        view = filtered_view(records, odd(key))
+        return lambda: len(view())
+
+    assert key_calls(incremental) == 1
+
+
+def retained(build):
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = build()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    assert kept is not None
+    return after - before
+
+
+def test_reactive_table_memory(rows=5_000, columns=20):
+    names = [f"c{j}" for j in range(columns)]
+
+    def as_rows():
+        records = ReactiveList(
+            EagerReactiveDict({name: float(i) for name in names}) for i in range(rows)
+        )
+        touch(records)
+        return records
+
+    def as_table():
+        return ReactiveTable({name: [float(i) for i in range(rows)] for name in names})
+
+    per_cell = retained(as_rows)
+    columnar = retained(as_table)
+    assert columnar * 20 < per_cell
+
+
+def test_dict_update_bumps_structure_once(keys=500):
+    data = {f"k{i}": i for i in range(keys)}
+
+    def load(assign):
+        d = ReactiveDict()
+        runs = []
+
+        def build(dispose):
+            create_effect(lambda: runs.append((d.keys(), d.values(), d.items())))
+            return dispose
+
+        dispose = create_root(build)
+        try:
+            del runs[:]
+            assign(d)
+            bumps = sum(s._value for s in (d.DICT_KEYS, d.DICT_VALS, d.DICT_ITEMS))
+            return len(runs), bumps
+        finally:
+            dispose()
+
+    def per_key(d):
+        for k, v in data.items():
+            d[k] = v
+
+    runs, bumps = load(per_key)
+    assert runs >= keys and bumps == 3 * keys
+    assert load(lambda d: d.update(data)) == (1, 3)
+
+
+def test_reconcile_work_is_proportional_to_changes(rows=2_000):
+    def fetch(changed=None):
+        return [{"id": i, "qty": i + (i == changed)} for i in range(rows)]
+
+    def refresh_work(refresh):
+        data = ReactiveDict({"rows": fetch()})
+        runs = []
+        changes = []
+
+        def build(dispose):
+            for i in range(rows):
+                create_effect(lambda i=i: (data["rows"][i]["qty"], runs.append(i)))
+            data["rows"].subscribe(changes.append)
+            return dispose
+
+        dispose = create_root(build)
+        try:
+            del runs[:]
+            refresh(data, fetch(changed=7))
+            assert data["rows"][7]["qty"] == 8
+            return runs, changes
+        finally:
+            dispose()
+
+    def assign(data, fresh):
+        data["rows"] = fresh
+
+    def patch(data, fresh):
+        reconcile(data, {"rows": fresh}, key="id")
+
+    replaced_runs, _ = refresh_work(assign)
+    patched_runs, patched_changes = refresh_work(patch)
+    assert len(replaced_runs) == rows
+    # only the row that changed re-runs and the list itself is untouched
+    assert patched_runs == [7]
+    assert patched_changes == []